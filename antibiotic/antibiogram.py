@@ -0,0 +1,309 @@
+"""
+Organism x drug antibiogram matrix.
+
+``Antibiogram.from_frame`` discovers the drug columns of any wide export (one
+row per isolate, one MIC column per drug), stores the MICs as a float32
+matrix and the remaining columns as categorical row metadata. Effectiveness,
+Gram-split and extreme-value queries are NumPy reductions over that matrix, so
+their cost does not depend on pandas reshaping.
+"""
+
+import numpy as np
+import pandas as pd
+
+ORGANISM_COLUMN = "Bacteria"
+GROUP_COLUMN = "Gram_Staining"
+QUANTILES = {"q25": 0.25, "median": 0.5, "q75": 0.75}
+
+
+# Isolate descriptors that can look numeric but are never drugs (any case).
+DEFAULT_METADATA = (
+    "id",
+    "isolate",
+    "isolate_id",
+    "sample_id",
+    "patient_id",
+    "age",
+    "patient_age",
+    "year",
+    "date",
+)
+
+
+def parse_mic(values):
+    """Convert MIC strings such as ``"<=0.5"`` or ``">16"`` to float32."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float32")
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    parsed = pd.to_numeric(values, errors="coerce")
+    # Only values with a qualifier or stray whitespace need the string pass.
+    qualified = parsed.isna() & values.notna()
+    if qualified.any():
+        cleaned = values[qualified].astype("string").str.replace(
+            r"[<>=\s]", "", regex=True
+        )
+        parsed[qualified] = pd.to_numeric(cleaned, errors="coerce")
+    return parsed.astype("float32")
+
+
+def _is_identifier(values):
+    """True for integer columns whose values are all distinct, e.g. isolate IDs."""
+    return (
+        pd.api.types.is_integer_dtype(values)
+        and len(values) > 1
+        and values.is_unique
+    )
+
+
+def parse_drug_columns(df, metadata=(), min_numeric=0.9):
+    """
+    Find the columns of ``df`` that hold MIC values and parse them once
+
+    A column is a drug when it is not listed in ``metadata`` or
+    ``DEFAULT_METADATA``, is not an integer ID column (all values distinct),
+    and at least ``min_numeric`` of its non-missing values parse as MICs.
+
+    Args:
+        df (pd.DataFrame): Wide antibiogram export
+        metadata (list): Columns describing the isolate, never drugs
+        min_numeric (float): Required share of parseable values
+
+    Returns:
+        dict: Drug column name -> float32 MICs (NaN if untested), frame order
+    """
+    excluded = {str(column).lower() for column in (*metadata, *DEFAULT_METADATA)}
+    drugs = {}
+    for column in df.columns:
+        values = df[column]
+        if str(column).lower() in excluded or _is_identifier(values):
+            continue
+        present = int(values.notna().sum())
+        if not present:
+            continue
+        parsed = parse_mic(values)
+        if parsed.notna().sum() >= min_numeric * present:
+            drugs[column] = parsed.to_numpy("float32", na_value=np.nan)
+    return drugs
+
+
+def discover_drug_columns(df, metadata=(), min_numeric=0.9):
+    """
+    Return the columns of ``df`` that hold MIC values
+
+    See ``parse_drug_columns``, which also returns the parsed values.
+
+    Returns:
+        list: Drug column names, in frame order
+    """
+    return list(parse_drug_columns(df, metadata, min_numeric))
+
+
+class Antibiogram:
+    """
+    Float32 MIC matrix with categorical row metadata
+
+    Args:
+        rows (pd.DataFrame): One row per isolate; ``ORGANISM_COLUMN`` and
+            ``GROUP_COLUMN`` categorical
+        mic (np.ndarray): float32 ``(isolates, drugs)`` matrix, NaN if untested
+        drugs (list): Drug name per matrix column
+    """
+
+    def __init__(self, rows, mic, drugs):
+        self.rows = rows.reset_index(drop=True)
+        # Column-major, so each drug's MICs are contiguous.
+        self.mic = np.asfortranarray(mic, dtype=np.float32)
+        self.drugs = list(drugs)
+        self._drug_index = {drug: i for i, drug in enumerate(self.drugs)}
+        self._frame = None
+        # Isolate positions by ascending MIC, one column per drug (NaN last),
+        # so sorting by any drug is a column lookup.
+        self._order = np.argsort(self.mic.T, axis=1, kind="stable").astype(np.int32).T
+
+        self.groups = list(self.rows[GROUP_COLUMN].cat.categories)
+        codes = self.rows[GROUP_COLUMN].cat.codes.to_numpy()
+        # Isolate x group indicator; group reductions are one matrix product.
+        self._membership = (codes[:, None] == np.arange(len(self.groups))).astype(
+            np.float32
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quantiles = np.nanquantile(self.mic, list(QUANTILES.values()), axis=0)
+            geomean = np.exp2(np.nanmean(np.log2(self.mic), axis=0))
+            self.summary = pd.DataFrame(
+                {
+                    "tested": np.isfinite(self.mic).sum(axis=0),
+                    "min": np.nanmin(self.mic, axis=0),
+                    **dict(zip(QUANTILES, quantiles)),
+                    "max": np.nanmax(self.mic, axis=0),
+                    "geomean": geomean,
+                },
+                index=pd.Index(self.drugs, name="Antibiotic"),
+            )
+
+    @classmethod
+    def from_frame(
+        cls,
+        df,
+        organism=ORGANISM_COLUMN,
+        group=GROUP_COLUMN,
+        metadata=None,
+        drugs=None,
+        min_numeric=0.9,
+    ):
+        """
+        Build an antibiogram from a wide export
+
+        Args:
+            df (pd.DataFrame): One row per isolate, one MIC column per drug
+            organism (str): Column naming the organism
+            group (str): Column used for the Gram split
+            metadata (list): Further columns that are never drugs, on top of
+                ``DEFAULT_METADATA``
+            drugs (list): Drug columns; discovered when None. Every other
+                column is kept as categorical row metadata
+            min_numeric (float): See ``parse_drug_columns``
+
+        Returns:
+            Antibiogram: Rows renamed to ``ORGANISM_COLUMN``/``GROUP_COLUMN``
+        """
+        metadata = [organism, group, *(metadata or [])]
+        if drugs is None:
+            parsed = parse_drug_columns(df, metadata, min_numeric)
+        else:
+            parsed = {
+                drug: parse_mic(df[drug]).to_numpy("float32", na_value=np.nan)
+                for drug in drugs
+            }
+        drugs = list(parsed)
+        rows = df.drop(columns=drugs).rename(
+            columns={organism: ORGANISM_COLUMN, group: GROUP_COLUMN}
+        )
+        rows = rows.astype({column: "category" for column in rows.columns})
+        mic = np.empty((len(df), len(drugs)), dtype=np.float32, order="F")
+        for i, values in enumerate(parsed.values()):
+            mic[:, i] = values
+        return cls(rows, mic, drugs)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def antibiotics(self):
+        return self.drugs
+
+    @property
+    def frame(self):
+        """Wide frame of row metadata plus one float32 column per drug."""
+        if self._frame is None:
+            mic = pd.DataFrame(self.mic, columns=self.drugs)
+            self._frame = pd.concat([self.rows, mic], axis=1)
+        return self._frame
+
+    def column(self, drug):
+        """MICs of ``drug`` for every isolate (a view, do not modify)."""
+        return self.mic[:, self._drug_index[drug]]
+
+    def _columns(self, drugs):
+        if drugs is None:
+            return np.arange(len(self.drugs))
+        return np.array([self._drug_index[drug] for drug in drugs], dtype=np.intp)
+
+    def order(self, drug):
+        """Isolate positions by ascending MIC of ``drug``, computed at load."""
+        return self._order[:, self._drug_index[drug]]
+
+    def melted(self, drugs, positions=None):
+        """
+        Long-form (Bacteria, Gram_Staining, Antibiotic, MIC) rows
+
+        Args:
+            drugs (list): Drugs to include, in order
+            positions (np.ndarray): Isolates to include; None keeps all
+
+        Returns:
+            pd.DataFrame: One row per isolate and drug, drug by drug
+        """
+        columns = self._columns(drugs)
+        rows, mic = self.rows, self.mic[:, columns]
+        if positions is not None:
+            rows, mic = rows.take(positions), mic[positions]
+        n_rows, n_drugs = mic.shape
+        long = {
+            name: pd.Categorical.from_codes(
+                np.tile(values.cat.codes.to_numpy(), n_drugs), dtype=values.dtype
+            )
+            for name, values in rows[[ORGANISM_COLUMN, GROUP_COLUMN]].items()
+        }
+        long["Antibiotic"] = pd.Categorical.from_codes(
+            np.repeat(np.arange(n_drugs), n_rows),
+            categories=[self.drugs[i] for i in columns],
+        )
+        long["MIC"] = mic.T.ravel()
+        return pd.DataFrame(long)
+
+    def effectiveness(self, drugs=None):
+        """Per-drug MIC summary (tested count, quartiles, geometric mean)."""
+        return self.summary.iloc[self._columns(drugs)]
+
+    def group_means(self, drugs=None):
+        """
+        Mean MIC per Gram group and drug, ignoring untested isolates
+
+        Returns:
+            pd.DataFrame: ``Gram_Staining``, ``Antibiotic``, ``MIC`` and
+            ``tested`` per group x drug with at least one tested isolate
+        """
+        columns = self._columns(drugs)
+        mic = self.mic[:, columns]
+        tested = np.isfinite(mic)
+        sums = self._membership.T @ np.where(tested, mic, 0).astype(np.float64)
+        counts = self._membership.T @ tested.astype(np.float32)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        n_groups, n_drugs = means.shape
+        grouped = pd.DataFrame(
+            {
+                GROUP_COLUMN: pd.Categorical.from_codes(
+                    np.repeat(np.arange(n_groups), n_drugs), categories=self.groups
+                ),
+                "Antibiotic": pd.Categorical.from_codes(
+                    np.tile(np.arange(n_drugs), n_groups),
+                    categories=[self.drugs[i] for i in columns],
+                ),
+                "MIC": means.ravel(),
+                "tested": counts.ravel().astype(np.int64),
+            }
+        )
+        return grouped[grouped["tested"] > 0].reset_index(drop=True)
+
+    def extremes(self, drug, k=2):
+        """
+        The ``k`` lowest- and ``k`` highest-MIC isolates for ``drug``
+
+        Uses ``argpartition``, so only the selected rows are sorted.
+
+        Returns:
+            pd.DataFrame: ``frame`` rows, most susceptible first
+        """
+        values = self.column(drug)
+        tested = np.flatnonzero(np.isfinite(values))
+        k = min(k, len(tested) // 2)
+        if k == 0:
+            return self.frame.iloc[:0]
+        tested_values = values[tested]
+        low = tested[np.argpartition(tested_values, k - 1)[:k]]
+        high = tested[np.argpartition(tested_values, len(tested) - k)[-k:]]
+        low = low[np.argsort(values[low], kind="stable")]
+        high = high[np.argsort(values[high], kind="stable")]
+        return self.frame.take(np.concatenate([low, high]))
+
+    def sorted_rows(self, drug):
+        """``frame`` rows by ascending MIC for ``drug``."""
+        return self.frame.take(self.order(drug))
+
+    def mic_range(self, drug):
+        """``(min, max)`` MIC for ``drug``."""
+        row = self.summary.loc[drug]
+        return row["min"], row["max"]
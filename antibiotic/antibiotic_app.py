@@ -1,10 +1,12 @@
 import streamlit as st
 import altair as alt
 import pandas as pd
+from antibiotic_utils import render_chart, show_panel, start_rerun
 
 st.set_page_config(page_title="Burtin Antibiotic Dataset App", layout="wide")
 
 st.title("Burtin's Antibiotic Dataset: Interactive Data Story")
+start_rerun("antibiotic")
 
 # Menu Overview
 st.markdown("""
@@ -40,7 +42,7 @@ diagram = (
     )
     .properties(width=500, height=400, title="Antibiotic Effectiveness by Gram Type (Illustrative)")
 )
-st.altair_chart(diagram, use_container_width=False)
+render_chart(diagram, use_container_width=False)
 
 st.markdown("""
 **Start by selecting a page from the sidebar.**
@@ -55,4 +57,5 @@ st.markdown("""
         <a href="https://www.linkedin.com/in/humphrey-ahn" target="_blank">LinkedIn</a>
     </sub>
 </div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+""", unsafe_allow_html=True)
+show_panel()
@@ -1,28 +1,329 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
 import pandas as pd
 import requests
 import streamlit as st
 
-def load_burtin_data(url: str = "https://cdn.jsdelivr.net/npm/vega-datasets@1/data/burtin.json") -> pd.DataFrame:
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.charts import enable_vegafusion, render_chart  # noqa: E402, F401
+from common.perf import show_panel, span, start_rerun  # noqa: E402, F401
+from antibiogram import GROUP_COLUMN, ORGANISM_COLUMN, Antibiogram  # noqa: E402
+from outliers import OutlierScores  # noqa: E402
+
+enable_vegafusion()
+
+BURTIN_URL = "https://cdn.jsdelivr.net/npm/vega-datasets@1/data/burtin.json"
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / "data"
+MIC_COLUMNS = ["Penicillin", "Streptomycin", "Neomycin"]
+# Drugs preselected on the comparison pages; large exports have hundreds.
+DEFAULT_ANTIBIOTICS = 8
+GRAM_TYPES = ["positive", "negative"]
+# Seconds before the local copy is revalidated in the background / before use.
+BURTIN_SOFT_TTL = float(os.getenv("BURTIN_SOFT_TTL", 24 * 3600))
+BURTIN_HARD_TTL = float(os.getenv("BURTIN_HARD_TTL", 30 * 24 * 3600))
+# Seconds between attempts once a refresh of an expired copy has failed.
+BURTIN_RETRY_AFTER = float(os.getenv("BURTIN_RETRY_AFTER", 300))
+
+
+def data_dir(directory=None):
+    return Path(directory or os.getenv("BURTIN_DATA_DIR") or DEFAULT_DATA_DIR)
+
+
+def _burtin_paths(directory=None):
+    path = data_dir(directory) / "burtin.json"
+    return path, path.with_suffix(".meta.json")
+
+
+def _read_meta(meta_path):
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def revalidate_burtin(url=BURTIN_URL, directory=None, timeout=10):
+    """
+    Refresh the local Burtin copy now with a conditional request
+
+    Sends the stored ``ETag``/``Last-Modified`` as ``If-None-Match``/
+    ``If-Modified-Since``; the copy is only rewritten when the server sends a
+    new one. When the request fails and a copy exists, the copy is kept and
+    the failure is recorded as ``failed_at`` in its metadata.
+
+    Args:
+        url (str): Dataset URL
+        directory (str | Path): Copy directory; defaults to
+            ``$BURTIN_DATA_DIR`` or ``antibiotic/data``
+        timeout (float): Request timeout in seconds
+    """
+    path, meta_path = _burtin_paths(directory)
+    meta = _read_meta(meta_path) if path.exists() else {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        if path.exists():
+            meta["failed_at"] = time.time()
+            _write_atomic(meta_path, json.dumps(meta).encode())
+            return
+        raise
+    if response.status_code != 304 or not path.exists():
+        _write_atomic(path, response.content)
+        meta = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    meta.pop("failed_at", None)
+    meta["checked_at"] = time.time()
+    _write_atomic(meta_path, json.dumps(meta).encode())
+
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate_in_background(url, directory, timeout):
+    """Run ``revalidate_burtin`` on a daemon thread, once per copy at a time."""
+    key = (url, str(data_dir(directory)))
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def run():
+        try:
+            revalidate_burtin(url, directory, timeout)
+        except Exception:
+            # The current copy stays in use; the next stale read retries.
+            pass
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=run, name="burtin-revalidate", daemon=True).start()
+
+
+def refresh_burtin_copy(
+    url=BURTIN_URL,
+    directory=None,
+    timeout=10,
+    soft_ttl=BURTIN_SOFT_TTL,
+    hard_ttl=BURTIN_HARD_TTL,
+    retry_after=BURTIN_RETRY_AFTER,
+):
+    """
+    Return the path of the local Burtin copy, stale-while-revalidate
+
+    A copy checked within ``soft_ttl`` seconds is used as is; an older one is
+    still used, while ``revalidate_burtin`` runs in the background. Only a
+    missing copy, or one unchecked for ``hard_ttl`` seconds, is revalidated
+    before returning. Once that blocking refresh has failed, the expired copy
+    is used as is and retried in the background at most every
+    ``retry_after`` seconds, so an unreachable server does not delay every
+    rerun.
+
+    Args:
+        url (str): Dataset URL
+        directory (str | Path): Copy directory; defaults to
+            ``$BURTIN_DATA_DIR`` or ``antibiotic/data``
+        timeout (float): Request timeout in seconds
+        soft_ttl (float): Age after which the copy is revalidated in the
+            background; defaults to ``$BURTIN_SOFT_TTL`` or one day
+        hard_ttl (float): Age after which the copy is revalidated before use;
+            defaults to ``$BURTIN_HARD_TTL`` or 30 days
+        retry_after (float): Seconds between refreshes of an expired copy
+            after one failed; defaults to ``$BURTIN_RETRY_AFTER`` or 5 minutes
+
+    Returns:
+        Path: Local copy, whose mtime changes only when its content does
     """
-    Load the Burtin antibiotic dataset from the given URL and return as a pandas DataFrame.
+    path, meta_path = _burtin_paths(directory)
+    if path.exists():
+        meta = _read_meta(meta_path)
+        now = time.time()
+        age = now - meta.get("checked_at", 0)
+        if age <= hard_ttl:
+            if age > soft_ttl:
+                _revalidate_in_background(url, directory, timeout)
+            return path
+        failed_at = meta.get("failed_at")
+        if failed_at is not None:
+            if now - failed_at > retry_after:
+                _revalidate_in_background(url, directory, timeout)
+            return path
+    revalidate_burtin(url, directory, timeout)
+    return path
+
+
+def fetch_burtin_json(url=BURTIN_URL, directory=None, timeout=10):
+    """
+    Return the Burtin records from the local copy, see ``refresh_burtin_copy``
+
+    The network is only on the critical path when there is no copy yet or the
+    copy is past the hard TTL; offline, an existing copy is always used.
+
+    Args:
+        url (str): Dataset URL
+        directory (str | Path): Copy directory; defaults to
+            ``$BURTIN_DATA_DIR`` or ``antibiotic/data``
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        list: Raw JSON records
     """
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.DataFrame(data)
+    path = refresh_burtin_copy(url, directory, timeout)
+    return json.loads(path.read_text())
+
+
+def burtin_version(url=BURTIN_URL, directory=None):
+    """
+    Identify the current Burtin copy, applying the refresh policy first
+
+    Passed to the cached loaders so a copy replaced by a background
+    revalidation is picked up on the next rerun.
+
+    Returns:
+        int: Modification time of the copy in nanoseconds
+    """
+    return refresh_burtin_copy(url, directory).stat().st_mtime_ns
+
+
+@st.cache_resource(show_spinner="Loading Burtin dataset...", max_entries=2)
+def load_burtin_data(url: str = BURTIN_URL, version=None) -> pd.DataFrame:
+    """
+    Load the Burtin antibiotic dataset as a typed pandas DataFrame.
+
+    Cached once per process and ``version`` and shared by every page, so the
+    first page visited warms the others. MIC columns are float32 and
+    Gram_Staining is categorical. The frame is shared: filter into new frames,
+    never modify it.
+    """
+    df = pd.DataFrame(fetch_burtin_json(url))
+    df[MIC_COLUMNS] = df[MIC_COLUMNS].astype("float32")
+    df["Gram_Staining"] = pd.Categorical(df["Gram_Staining"], categories=GRAM_TYPES)
     return df
 
+def read_antibiogram(source):
+    """Read a wide antibiogram export (CSV, Parquet or JSON) from a path or URL."""
+    name = str(source).lower()
+    if name.endswith((".parquet", ".pq")):
+        return pd.read_parquet(source)
+    if name.endswith(".json"):
+        return pd.read_json(source)
+    return pd.read_csv(source, compression="infer")
+
+
+def _source_version(source):
+    """Cache key part for ``source``; only the Burtin copy is refreshed."""
+    return burtin_version() if source is None else None
+
+
+def _metadata_columns(metadata):
+    """``metadata`` as a hashable tuple, defaulting to ``$ANTIBIOGRAM_METADATA``."""
+    if metadata is None:
+        metadata = os.getenv("ANTIBIOGRAM_METADATA", "").split(",")
+    return tuple(column.strip() for column in metadata if column.strip())
+
+
+@st.cache_resource(show_spinner="Indexing antibiogram...", max_entries=4)
+def _load_antibiogram(source, organism, group, metadata, version):
+    if source is None:
+        burtin = load_burtin_data(version=version)
+        return Antibiogram.from_frame(burtin, drugs=MIC_COLUMNS)
+    return Antibiogram.from_frame(
+        read_antibiogram(source), organism, group, metadata=list(metadata)
+    )
+
+
+def load_antibiogram(
+    source=None, organism=ORGANISM_COLUMN, group=GROUP_COLUMN, metadata=None
+):
+    """
+    Build the ``Antibiogram`` behind every page once per process
+
+    Rebuilt when a background revalidation replaces the Burtin copy.
+
+    Args:
+        source (str): Wide export to load; defaults to ``$ANTIBIOGRAM_SOURCE``,
+            or the Burtin dataset when unset
+        organism (str): Column naming the organism in ``source``
+        group (str): Column holding the Gram stain in ``source``
+        metadata (list): Numeric columns of ``source`` that are not drugs, such
+            as a collection year; defaults to the comma-separated
+            ``$ANTIBIOGRAM_METADATA``. ``antibiogram.DEFAULT_METADATA`` and
+            integer ID columns are always excluded
+
+    Returns:
+        Antibiogram: Shared between pages; never modify it
+    """
+    source = source or os.getenv("ANTIBIOGRAM_SOURCE")
+    return _load_antibiogram(
+        source, organism, group, _metadata_columns(metadata), _source_version(source)
+    )
+
+
+@st.cache_resource(show_spinner="Scoring outliers...", max_entries=4)
+def _load_outlier_scores(source, metadata, version):
+    return OutlierScores(
+        _load_antibiogram(source, ORGANISM_COLUMN, GROUP_COLUMN, metadata, version)
+    )
+
+
+def load_outlier_scores(source=None, metadata=None):
+    """
+    Score every drug of ``load_antibiogram(source, metadata=metadata)`` once
+    per process; the per-drug tables are cached inside the returned
+    ``OutlierScores``.
+    """
+    source = source or os.getenv("ANTIBIOGRAM_SOURCE")
+    return _load_outlier_scores(
+        source, _metadata_columns(metadata), _source_version(source)
+    )
+
+
 def get_antibiotics():
     """
     Return the list of antibiotics in the dataset.
     """
-    return ["Penicillin", "Streptomycin", "Neomycin"]
+    return load_antibiogram().drugs
+
+def get_default_antibiotics(limit=DEFAULT_ANTIBIOTICS):
+    """
+    Return the ``limit`` most-tested antibiotics, in dataset order.
+    """
+    antibiogram = load_antibiogram()
+    tested = antibiogram.summary["tested"].nlargest(limit).index
+    return [drug for drug in antibiogram.drugs if drug in tested]
 
 def get_gram_types():
     """
     Return the list of Gram stain types in the dataset.
     """
-    return ["positive", "negative"]
+    return load_antibiogram().groups
 
 def show_sidebar_footer():
     st.sidebar.markdown("""
@@ -0,0 +1,165 @@
+"""
+Robust MIC outlier scores for every drug of an ``Antibiogram`` at once.
+
+MICs are doubling dilutions, so scores are computed on log2(MIC):
+
+* ``z`` - classic z-score per drug;
+* ``robust_z`` - 0.6745 * (x - median) / MAD within the isolate's Gram group,
+  so a resistant Gram-negative is compared with other Gram-negatives;
+* ``below``/``above`` - Tukey IQR fences per drug.
+
+Every score is one NumPy reduction over the isolate x drug matrix
+(``nanquantile`` partitions rather than sorts), and the per-drug tables the
+page reads are built on first use and cached.
+"""
+
+import numpy as np
+import pandas as pd
+
+from antibiogram import GROUP_COLUMN, ORGANISM_COLUMN
+
+# Scales the MAD to a standard deviation under normality.
+MAD_SCALE = 0.6745
+IQR_FACTOR = 1.5
+ROBUST_Z_THRESHOLD = 3.5
+METHODS = {
+    "Robust z (MAD per Gram group)": "robust",
+    "z-score": "zscore",
+    "IQR fences": "iqr",
+}
+
+
+def log2_mic(mic):
+    """log2 of a MIC matrix; untested and non-positive MICs become NaN."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logged = np.log2(mic)
+    logged[~np.isfinite(logged)] = np.nan
+    return logged
+
+
+def zscores(logged):
+    """Column-wise z-scores, NaN where a drug has no spread."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (logged - np.nanmean(logged, axis=0)) / np.nanstd(logged, axis=0)
+
+
+def iqr_fences(logged, factor=IQR_FACTOR):
+    """Return per-drug ``(lower, upper)`` Tukey fences."""
+    q1, q3 = np.nanquantile(logged, [0.25, 0.75], axis=0)
+    spread = factor * (q3 - q1)
+    return q1 - spread, q3 + spread
+
+
+def group_robust_z(logged, codes, n_groups):
+    """
+    Robust z-scores against each isolate's group median and MAD
+
+    Args:
+        logged (np.ndarray): ``(isolates, drugs)`` log2 MICs
+        codes (np.ndarray): Group code per isolate, -1 for none
+        n_groups (int): Number of groups
+
+    Returns:
+        np.ndarray: Same shape as ``logged``; NaN where the MAD is zero
+    """
+    scores = np.full(logged.shape, np.nan, dtype=np.float32)
+    for group in range(n_groups):
+        members = codes == group
+        if not members.any():
+            continue
+        block = logged[members]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            median = np.nanmedian(block, axis=0)
+            mad = np.nanmedian(np.abs(block - median), axis=0)
+            scores[members] = MAD_SCALE * (block - median) / mad
+    scores[~np.isfinite(scores)] = np.nan
+    return scores
+
+
+def top_k(values, k, largest=True):
+    """
+    Positions of the ``k`` largest (or smallest) finite values, ordered
+
+    ``argpartition`` selects them in O(n); only the ``k`` winners are sorted.
+    """
+    finite = np.flatnonzero(np.isfinite(values))
+    k = min(k, len(finite))
+    if k == 0:
+        return finite
+    keyed = -values[finite] if largest else values[finite]
+    chosen = finite[np.argpartition(keyed, k - 1)[:k]]
+    return chosen[np.argsort(-values[chosen] if largest else values[chosen])]
+
+
+class OutlierScores:
+    """
+    All outlier scores for an ``Antibiogram``, computed once
+
+    Args:
+        antibiogram (Antibiogram): Matrix to score
+    """
+
+    def __init__(self, antibiogram):
+        self.antibiogram = antibiogram
+        self.logged = log2_mic(antibiogram.mic)
+        self.z = zscores(self.logged)
+        self.lower, self.upper = iqr_fences(self.logged)
+        codes = antibiogram.rows[GROUP_COLUMN].cat.codes.to_numpy()
+        self.robust_z = group_robust_z(self.logged, codes, len(antibiogram.groups))
+        self._tables = {}
+
+    def table(self, drug):
+        """
+        Per-isolate scores and flags for ``drug``, cached after the first call
+
+        Returns:
+            pd.DataFrame: Bacteria, Gram_Staining, MIC, log2 MIC, ``z``,
+            ``robust_z``, ``below``/``above`` fence flags; untested isolates
+            are dropped
+        """
+        if drug not in self._tables:
+            i = self.antibiogram.drugs.index(drug)
+            logged = self.logged[:, i]
+            tested = np.flatnonzero(np.isfinite(logged))
+            rows = self.antibiogram.rows
+            self._tables[drug] = pd.DataFrame(
+                {
+                    ORGANISM_COLUMN: rows[ORGANISM_COLUMN].take(tested).array,
+                    GROUP_COLUMN: rows[GROUP_COLUMN].take(tested).array,
+                    "MIC": self.antibiogram.mic[tested, i],
+                    "log2_MIC": logged[tested],
+                    "z": self.z[tested, i],
+                    "robust_z": self.robust_z[tested, i],
+                    "below": logged[tested] < self.lower[i],
+                    "above": logged[tested] > self.upper[i],
+                },
+                index=tested,
+            )
+        return self._tables[drug]
+
+    def flagged(self, drug, method="robust", threshold=ROBUST_Z_THRESHOLD):
+        """
+        Boolean outlier flag per tested isolate of ``drug``
+
+        Args:
+            drug (str): Drug to score
+            method (str): ``"robust"``, ``"zscore"`` or ``"iqr"``
+            threshold (float): |score| cut-off for the z-score methods
+
+        Returns:
+            pd.Series: Aligned with ``table(drug)``
+        """
+        table = self.table(drug)
+        if method == "iqr":
+            return table["below"] | table["above"]
+        column = "robust_z" if method == "robust" else "z"
+        return table[column].abs() > threshold
+
+    def extremes(self, drug, k=2):
+        """``k`` most susceptible then ``k`` most resistant rows of ``table``."""
+        table = self.table(drug)
+        values = table["log2_MIC"].to_numpy()
+        k = min(k, len(values) // 2)
+        low = top_k(values, k, largest=False)
+        high = top_k(values, k, largest=True)[::-1]
+        return table.iloc[np.concatenate([low, high])]
@@ -2,11 +2,12 @@
 import streamlit as st
 import altair as alt
 import pandas as pd
-from antibiotic_utils import show_sidebar_footer
+from antibiotic_utils import show_sidebar_footer, render_chart, show_panel, start_rerun
 
 st.set_page_config(page_title="Burtin Antibiotic Dataset: Introduction", layout="wide")
 
 st.title("01. Introduction")
+start_rerun("antibiotic/01_introduction")
 
 st.markdown("""
 ### Welcome!
@@ -45,7 +46,7 @@ info_chart = (
     )
     .properties(width=500, height=400, title="Antibiotics and Gram Types")
 )
-st.altair_chart(info_chart, use_container_width=False)
+render_chart(info_chart, use_container_width=False)
 
 st.markdown("""
 ---
@@ -53,3 +54,4 @@ st.markdown("""
 """)
 
 show_sidebar_footer()
+show_panel()
@@ -2,10 +2,13 @@
 import streamlit as st
 import pandas as pd
 from antibiotic_utils import (
-    load_burtin_data,
+    load_antibiogram,
     get_antibiotics,
     get_gram_types,
     show_sidebar_footer,
+    show_panel,
+    span,
+    start_rerun,
 )
 import altair as alt
 
@@ -13,15 +16,13 @@ st.set_page_config(
     page_title="Data Exploration - Burtin Antibiotic Dataset", layout="wide"
 )
 st.title("02. Data Exploration")
+start_rerun("antibiotic/02_data_exploration")
 
 
-# Load data
-@st.cache_data
-def get_data():
-    return load_burtin_data()
-
-
-df = get_data()
+# Load data (cached once per process and shared by every page)
+with span("load") as s:
+    antibiogram = load_antibiogram()
+    df = s.record(antibiogram.frame)
 
 # Sidebar filters
 st.sidebar.header("Filter Data")
@@ -33,8 +34,7 @@ selected_gram = st.sidebar.multiselect(
 antibiotics = get_antibiotics()
 selected_antibiotic = st.sidebar.selectbox("Antibiotic (for MIC filter)", antibiotics)
 
-mic_min = int(df[selected_antibiotic].min())
-mic_max = int(df[selected_antibiotic].max())
+mic_min, mic_max = (int(mic) for mic in antibiogram.mic_range(selected_antibiotic))
 selected_mic = st.sidebar.slider(
     f"MIC Range for {selected_antibiotic}", mic_min, mic_max, (mic_min, mic_max)
 )
@@ -53,4 +53,5 @@ st.markdown("""
 - **Explore:** Click column headers to sort, and use the table search to find specific bacteria.
 """)
 
-show_sidebar_footer() 
\ No newline at end of file
+show_sidebar_footer()
+show_panel()
@@ -1,32 +1,26 @@
 # Page Title: Antibiotic Effectiveness
 import streamlit as st
 import pandas as pd
-from antibiotic_utils import load_burtin_data, get_antibiotics, show_sidebar_footer
+from antibiotic_utils import load_antibiogram, get_antibiotics, get_default_antibiotics, show_sidebar_footer, render_chart, show_panel, span, start_rerun
 import altair as alt
 
 st.set_page_config(page_title="03. Antibiotic Effectiveness", layout="wide")
 st.title("03. Antibiotic Effectiveness")
+start_rerun("antibiotic/03_antibiotic_effectiveness")
 
-# Load data
-@st.cache_data
-def get_data():
-    return load_burtin_data()
-
-df = get_data()
+# Load data (cached once per process and shared by every page)
+with span("load"):
+    antibiogram = load_antibiogram()
 
 # Sidebar: select antibiotics to compare
 antibiotics = get_antibiotics()
 selected_antibiotics = st.sidebar.multiselect(
-    "Select Antibiotics to Compare", antibiotics, default=antibiotics
+    "Select Antibiotics to Compare", antibiotics, default=get_default_antibiotics()
 )
 
-# Melt data for Altair
-melted = df.melt(
-    id_vars=["Bacteria", "Gram_Staining"],
-    value_vars=selected_antibiotics,
-    var_name="Antibiotic",
-    value_name="MIC"
-)
+# Long-form rows for Altair, sliced from the MIC matrix
+with span("prepare:melt") as s:
+    melted = s.record(antibiogram.melted(selected_antibiotics))
 
 # Bar chart: lower MIC = more effective
 st.markdown("### Antibiotic Effectiveness Across Bacteria")
@@ -43,7 +37,7 @@ chart = (
     .properties(width=800, height=400)
     .interactive()
 )
-st.altair_chart(chart, use_container_width=True)
+render_chart(chart, use_container_width=True)
 
 # Heatmap: MIC values for all bacteria/antibiotic pairs
 st.markdown("### MIC Heatmap for All Bacteria and Antibiotics")
@@ -59,9 +53,10 @@ heatmap = (
     )
     .properties(width=400, height=400, title="MIC Heatmap (Lower = More Effective)")
 )
-st.altair_chart(heatmap, use_container_width=False)
+render_chart(heatmap, use_container_width=False)
 
 st.markdown("""
 - **Tip:** Select one or more antibiotics in the sidebar to compare their effectiveness across all bacteria. Lower MIC values indicate higher effectiveness.
 """) 
-show_sidebar_footer()
\ No newline at end of file
+show_sidebar_footer()
+show_panel()
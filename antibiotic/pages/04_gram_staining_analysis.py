@@ -1,32 +1,26 @@
 # Page Title: Gram Staining Analysis
 import streamlit as st
 import pandas as pd
-from antibiotic_utils import load_burtin_data, get_antibiotics, show_sidebar_footer
+from antibiotic_utils import load_antibiogram, get_antibiotics, get_default_antibiotics, show_sidebar_footer, render_chart, show_panel, span, start_rerun
 import altair as alt
 
 st.set_page_config(page_title="04. Gram Staining Analysis", layout="wide")
 st.title("04. Gram Staining Analysis")
+start_rerun("antibiotic/04_gram_staining_analysis")
 
-# Load data
-@st.cache_data
-def get_data():
-    return load_burtin_data()
-
-df = get_data()
+# Load data (cached once per process and shared by every page)
+with span("load"):
+    antibiogram = load_antibiogram()
 
 # Sidebar: select antibiotics
 antibiotics = get_antibiotics()
 selected_antibiotics = st.sidebar.multiselect(
-    "Select Antibiotics", antibiotics, default=antibiotics
+    "Select Antibiotics", antibiotics, default=get_default_antibiotics()
 )
 
-# Melt data for Altair
-melted = df.melt(
-    id_vars=["Bacteria", "Gram_Staining"],
-    value_vars=selected_antibiotics,
-    var_name="Antibiotic",
-    value_name="MIC"
-)
+# Long-form rows for Altair, sliced from the MIC matrix
+with span("prepare:melt") as s:
+    melted = s.record(antibiogram.melted(selected_antibiotics))
 
 # Boxplot: MIC by Gram type and antibiotic
 st.markdown("### MIC Distribution by Gram Type and Antibiotic")
@@ -42,14 +36,13 @@ chart = (
     )
     .properties(width=600, height=400)
 )
-st.altair_chart(chart, use_container_width=True)
+render_chart(chart, use_container_width=True)
 
 # Grouped bar chart: mean MIC by Gram type and antibiotic
 st.markdown("### Mean MIC by Gram Type and Antibiotic")
 st.write("This grouped bar chart summarizes the average MIC for each antibiotic, split by Gram-positive and Gram-negative bacteria. Lower bars indicate more effective antibiotics for that group.")
-grouped = (
-    melted.groupby(["Gram_Staining", "Antibiotic"]).MIC.mean().reset_index()
-)
+with span("aggregate:group_means") as s:
+    grouped = s.record(antibiogram.group_means(selected_antibiotics))
 grouped_chart = (
     alt.Chart(grouped)
     .mark_bar()
@@ -62,7 +55,7 @@ grouped_chart = (
     )
     .properties(width=120, height=300, title="Mean MIC by Gram Type and Antibiotic")
 )
-st.altair_chart(grouped_chart, use_container_width=True)
+render_chart(grouped_chart, use_container_width=True)
 
 st.markdown("""
 - **Tip:** Select antibiotics in the sidebar to compare their effectiveness for Gram-positive vs. Gram-negative bacteria. Lower MIC values indicate higher effectiveness.
@@ -78,4 +71,5 @@ st.markdown("""
         <a href="https://www.linkedin.com/in/humphrey-ahn" target="_blank">LinkedIn</a>
     </sub>
 </div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+""", unsafe_allow_html=True)
+show_panel()
@@ -1,66 +1,70 @@
 # Page Title: Outliers & Exceptions
 import streamlit as st
-import pandas as pd
-from antibiotic_utils import load_burtin_data, get_antibiotics, show_sidebar_footer
+from antibiotic_utils import load_outlier_scores, get_antibiotics, show_sidebar_footer, render_chart, show_panel, span, start_rerun
+from outliers import METHODS, ROBUST_Z_THRESHOLD
 import altair as alt
 
 st.set_page_config(page_title="05. Outliers & Exceptions", layout="wide")
 st.title("05. Outliers & Exceptions")
+start_rerun("antibiotic/05_outliers_exceptions")
 
-# Load data
-@st.cache_data
-def get_data():
-    return load_burtin_data()
+# Load data (scores for every antibiotic, cached once per process)
+with span("load"):
+    scores = load_outlier_scores()
 
-df = get_data()
-
-# Sidebar: select antibiotic
+# Sidebar: select antibiotic and outlier rule
 antibiotics = get_antibiotics()
 selected_antibiotic = st.sidebar.selectbox("Select Antibiotic", antibiotics)
+selected_method = METHODS[st.sidebar.selectbox("Outlier Rule", list(METHODS))]
+threshold = ROBUST_Z_THRESHOLD
+if selected_method != "iqr":
+    threshold = st.sidebar.slider("|z| Threshold", 1.0, 5.0, ROBUST_Z_THRESHOLD, 0.5)
 
-# Find outliers: top 2 most resistant (highest MIC) and top 2 most susceptible (lowest MIC)
-sorted_df = df.sort_values(selected_antibiotic)
-most_susceptible = sorted_df.head(2)
-most_resistant = sorted_df.tail(2)
-
-highlight = pd.concat([most_susceptible, most_resistant])
+# Flag outliers on log2 MIC; fall back to the two most susceptible and two
+# most resistant bacteria when nothing is statistically unusual
+with span("prepare:outliers") as s:
+    table = scores.table(selected_antibiotic)
+    highlight = table[scores.flagged(selected_antibiotic, selected_method, threshold)]
+    if highlight.empty:
+        highlight = scores.extremes(selected_antibiotic, k=2)
+    chart_data = s.record(table.assign(Outlier=table.index.isin(highlight.index)))
 
 # Bar chart: highlight outliers
 st.markdown("### Outlier Bacteria for Selected Antibiotic")
-st.write("This bar chart highlights the two most susceptible and two most resistant bacteria (in orange) for the selected antibiotic. These outliers may warrant special attention in clinical decisions.")
+st.write("This bar chart highlights (in orange) the bacteria flagged as outliers by the selected rule, or the two most susceptible and two most resistant bacteria when none are flagged. These outliers may warrant special attention in clinical decisions.")
 chart = (
-    alt.Chart(df)
+    alt.Chart(chart_data)
     .mark_bar()
     .encode(
         x=alt.X("Bacteria:N", sort="-y", title="Bacterial Species"),
-        y=alt.Y(f"{selected_antibiotic}:Q", title="MIC (lower = more effective)"),
+        y=alt.Y("MIC:Q", title="MIC (lower = more effective)"),
         color=alt.condition(
-            alt.FieldOneOfPredicate(field="Bacteria", oneOf=highlight["Bacteria"].tolist()),
+            alt.FieldEqualPredicate(field="Outlier", equal=True),
             alt.value("orange"),
             alt.value("steelblue")
         ),
-        tooltip=["Bacteria", f"{selected_antibiotic}", "Gram_Staining"]
+        tooltip=["Bacteria", "MIC", "Gram_Staining", alt.Tooltip("robust_z", format=".2f")]
     )
     .properties(width=800, height=400)
     .interactive()
 )
-st.altair_chart(chart, use_container_width=True)
+render_chart(chart, use_container_width=True)
 
 # Scatter plot: all bacteria, outliers annotated
 st.markdown("### Outlier Annotation: Susceptible and Resistant Bacteria")
 st.write("This scatter plot shows all bacteria for the selected antibiotic, with outliers labeled in orange. Use this to quickly spot which bacteria are most and least affected by the antibiotic.")
 scatter = (
-    alt.Chart(df)
+    alt.Chart(chart_data)
     .mark_circle(size=120)
     .encode(
         x=alt.X("Bacteria:N", sort="-y", title="Bacterial Species"),
-        y=alt.Y(f"{selected_antibiotic}:Q", title="MIC (lower = more effective)"),
+        y=alt.Y("MIC:Q", title="MIC (lower = more effective)"),
         color=alt.condition(
-            alt.FieldOneOfPredicate(field="Bacteria", oneOf=highlight["Bacteria"].tolist()),
+            alt.FieldEqualPredicate(field="Outlier", equal=True),
             alt.value("orange"),
             alt.value("gray")
         ),
-        tooltip=["Bacteria", f"{selected_antibiotic}", "Gram_Staining"]
+        tooltip=["Bacteria", "MIC", "Gram_Staining", alt.Tooltip("robust_z", format=".2f")]
     )
     .properties(width=800, height=600, title="Outliers Highlighted (Orange)")
 )
@@ -70,15 +74,16 @@ text = (
     .mark_text(align="left", dx=5, dy=-10, fontSize=12, fontWeight="bold", color="orange")
     .encode(
         x=alt.X("Bacteria:N", sort="-y"),
-        y=alt.Y(f"{selected_antibiotic}:Q"),
+        y=alt.Y("MIC:Q"),
         text=alt.Text("Bacteria:N")
     )
 )
-st.altair_chart(scatter + text, use_container_width=True)
+render_chart(scatter + text, use_container_width=True)
 
 st.markdown("""
-- **Highlighted in orange:** The two most susceptible and two most resistant bacteria for the selected antibiotic.
-- **Tip:** Use the sidebar to change the antibiotic and see which bacteria are outliers.
+- **Highlighted in orange:** Bacteria flagged by the selected rule on log2 MIC. *Robust z* compares each bacterium with the median and MAD of its own Gram group; *z-score* and *IQR fences* compare it with all bacteria.
+- **Tip:** Use the sidebar to change the antibiotic, the outlier rule and its threshold.
 """)
 
-show_sidebar_footer() 
\ No newline at end of file
+show_sidebar_footer()
+show_panel()
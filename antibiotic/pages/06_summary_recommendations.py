@@ -2,10 +2,11 @@
 import streamlit as st
 import altair as alt
 import pandas as pd
-from antibiotic_utils import show_sidebar_footer
+from antibiotic_utils import show_sidebar_footer, render_chart, show_panel, start_rerun
 
 st.set_page_config(page_title="06. Summary & Recommendations", layout="wide")
 st.title("06. Summary & Recommendations")
+start_rerun("antibiotic/06_summary_recommendations")
 
 st.markdown("""
 ## Key Findings
@@ -44,7 +45,7 @@ chart = (
     )
     .properties(width=500, height=400, title="Antibiotic Recommendations by Gram Type (Traffic Light)")
 )
-st.altair_chart(chart, use_container_width=False)
+render_chart(chart, use_container_width=False)
 
 st.markdown("""
 ## Recommendations
@@ -57,4 +58,5 @@ st.markdown("""
 This concludes the interactive exploration of Burtin's Antibiotic Dataset. Use the sidebar to revisit any page or explore the data further!
 """)
 
-show_sidebar_footer() 
\ No newline at end of file
+show_sidebar_footer()
+show_panel()
@@ -0,0 +1,47 @@
+"""Serial vs. concurrent full-country pulls against the local Scorecard stub.
+
+Usage:
+    python benchmarks/bench_pagination.py [--total 6500] [--latency 0.15]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "termproject" / "src"))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stub_scorecard import StubScorecardServer  # noqa: E402
+from collegescore import CollegeScorecardClient  # noqa: E402
+
+FIELDS = [
+    "2022.cost.tuition.in_state",
+    "2022.cost.attendance.academic_year",
+    "2022.student.size",
+    "school.name",
+    "school.state",
+    "school.ownership",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--total", type=int, default=6500)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    with StubScorecardServer(total=args.total, latency=args.latency) as stub:
+        client = CollegeScorecardClient(api_key="bench", base_url=stub.base_url)
+        print(f"{args.total} institutions, {args.latency * 1000:.0f} ms per request")
+        for workers in args.workers:
+            start = time.perf_counter()
+            rows = client.get_all_institutions(fields=FIELDS, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"  max_workers={workers:<3} {len(rows)} rows in {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Allocation and wall-time comparison of the cost/enrollment preparation.
+
+Runs the original column-by-column ``prepare_cost_data`` /
+``prepare_enrollment_data`` (kept below as ``legacy_*``) and the shared
+float32 preparation stage over a synthetic 6,500-institution x 6-year frame.
+
+Usage:
+    python benchmarks/bench_prepare.py [--rows 6500] [--repeat 20]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "termproject" / "src"))
+
+from collegescore import SCHOOL_FIELDS, YEAR_METRICS  # noqa: E402
+from data import prepare_base, prepare_cost_data, prepare_enrollment_data  # noqa: E402
+from snapshot import YEARS  # noqa: E402
+
+
+def synthetic_frame(rows, years=YEARS, seed=0):
+    """Scorecard-shaped frame with every year's dotted metric columns."""
+    rng = np.random.default_rng(seed)
+    columns = {
+        "id": np.arange(100000, 100000 + rows),
+        "school.name": [f"Institution {i}" for i in range(rows)],
+        "school.state": rng.choice(["CA", "TX", "NY", "FL", "IL"], rows),
+        "school.ownership": rng.integers(1, 4, rows),
+        "school.control": rng.integers(1, 4, rows),
+        "school.region_id": rng.integers(1, 10, rows),
+    }
+    for year in years:
+        for metric in YEAR_METRICS:
+            if metric.startswith("cost."):
+                values = rng.integers(3000, 80000, rows).astype(float)
+            elif metric == "student.size":
+                values = rng.integers(0, 60000, rows).astype(float)
+            else:
+                values = rng.random(rows)
+            values[rng.random(rows) < 0.1] = np.nan
+            columns[f"{year}.{metric}"] = values
+    return pd.DataFrame(columns)[
+        SCHOOL_FIELDS + [f"{y}.{m}" for y in years for m in YEAR_METRICS]
+    ]
+
+
+def legacy_prepare_cost_data(df, year):
+    cost_data = pd.DataFrame(
+        {
+            "Institution": df["school.name"],
+            "State": df["school.state"],
+            "Type": df["school.ownership"].map(
+                {1: "Public", 2: "Private Nonprofit", 3: "Private For-Profit"}
+            ),
+            "In-State Tuition": pd.to_numeric(
+                df.get(f"{year}.cost.tuition.in_state", 0), errors="coerce"
+            ),
+            "Out-of-State Tuition": pd.to_numeric(
+                df.get(f"{year}.cost.tuition.out_of_state", 0), errors="coerce"
+            ),
+            "Total Cost": pd.to_numeric(
+                df.get(f"{year}.cost.attendance.academic_year", 0), errors="coerce"
+            ),
+            "Net Price (Public)": pd.to_numeric(
+                df.get(f"{year}.cost.avg_net_price.public", 0), errors="coerce"
+            ),
+            "Net Price (Private)": pd.to_numeric(
+                df.get(f"{year}.cost.avg_net_price.private", 0), errors="coerce"
+            ),
+        }
+    )
+    cost_melted = cost_data.melt(
+        id_vars=["Institution", "State", "Type"],
+        value_vars=[
+            "In-State Tuition",
+            "Out-of-State Tuition",
+            "Total Cost",
+            "Net Price (Public)",
+            "Net Price (Private)",
+        ],
+        var_name="Cost Type",
+        value_name="Cost",
+    )
+    cost_melted = cost_melted[cost_melted["Cost"] > 0]
+    avg_cost = cost_melted.groupby(["Type", "Cost Type"])["Cost"].mean().reset_index()
+    return cost_data, cost_melted, avg_cost
+
+
+def legacy_prepare_enrollment_data(df, year):
+    enroll_data = pd.DataFrame(
+        {
+            "Institution": df["school.name"],
+            "State": df["school.state"],
+            "Type": df["school.ownership"].map(
+                {1: "Public", 2: "Private Nonprofit", 3: "Private For-Profit"}
+            ),
+            "Enrollment": pd.to_numeric(
+                df.get(f"{year}.student.size", 0), errors="coerce"
+            ),
+            "White": pd.to_numeric(
+                df.get(f"{year}.student.demographics.race_ethnicity.white", 0),
+                errors="coerce",
+            ),
+            "Black": pd.to_numeric(
+                df.get(f"{year}.student.demographics.race_ethnicity.black", 0),
+                errors="coerce",
+            ),
+            "Hispanic": pd.to_numeric(
+                df.get(f"{year}.student.demographics.race_ethnicity.hispanic", 0),
+                errors="coerce",
+            ),
+            "Asian": pd.to_numeric(
+                df.get(f"{year}.student.demographics.race_ethnicity.asian", 0),
+                errors="coerce",
+            ),
+            "First Gen": pd.to_numeric(
+                df.get(f"{year}.student.demographics.first_generation", 0),
+                errors="coerce",
+            ),
+        }
+    )
+    enroll_data = enroll_data[enroll_data["Enrollment"] > 0]
+    enroll_by_type = enroll_data.groupby("Type")["Enrollment"].sum().reset_index()
+    demo_cols = ["White", "Black", "Hispanic", "Asian", "First Gen"]
+    demo_melted = enroll_data.melt(
+        id_vars=["Institution", "Type"],
+        value_vars=demo_cols,
+        var_name="Demographic",
+        value_name="Count",
+    )
+    demo_melted = demo_melted[demo_melted["Count"] > 0]
+    return enroll_data, enroll_by_type, demo_melted
+
+
+def legacy(df, years):
+    for year in years:
+        legacy_prepare_cost_data(df, year)
+        legacy_prepare_enrollment_data(df, year)
+
+
+def shared(df, years):
+    for year in years:
+        base = prepare_base(df, year)
+        prepare_cost_data(df, year, base=base)
+        prepare_enrollment_data(df, year, base=base)
+
+
+def measure(fn, df, years, repeat):
+    """Return (seconds per run, peak traced bytes) for ``fn``."""
+    tracemalloc.start()
+    fn(df, years)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(df, years)
+    return (time.perf_counter() - start) / repeat, peak
+
+
+def check_equivalent(df, year):
+    _, _, legacy_avg = legacy_prepare_cost_data(df, year)
+    _, _, avg = prepare_cost_data(df, year)
+    merged = legacy_avg.merge(
+        avg.astype({"Type": str, "Cost Type": str}), on=["Type", "Cost Type"]
+    )
+    assert len(merged) == len(legacy_avg)
+    assert np.allclose(merged["Cost_x"], merged["Cost_y"], rtol=1e-5)
+
+    _, legacy_enroll, legacy_demo = legacy_prepare_enrollment_data(df, year)
+    _, enroll, demo = prepare_enrollment_data(df, year)
+    assert np.allclose(
+        legacy_enroll.sort_values("Type")["Enrollment"],
+        enroll.astype({"Type": str}).sort_values("Type")["Enrollment"],
+    )
+    assert len(legacy_demo) == len(demo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=6500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    check_equivalent(df, YEARS[-1])
+
+    print(f"{args.rows} rows x {len(YEARS)} years")
+    results = {
+        "legacy": measure(legacy, df, YEARS, args.repeat),
+        "shared": measure(shared, df, YEARS, args.repeat),
+    }
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<7} {seconds * 1000:8.1f} ms   peak {peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Per-request latency and 429 recovery of the pooled Scorecard client.
+
+Compares bare ``requests.get`` calls with the client's keep-alive session, then
+runs a full pull against a stub that throttles every few requests.
+
+Usage:
+    python benchmarks/bench_session.py [--requests 200] [--throttle-every 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "termproject" / "src"))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stub_scorecard import StubScorecardServer  # noqa: E402
+from collegescore import CollegeScorecardClient  # noqa: E402
+
+PARAMS = {"fields": "school.name,school.state", "per_page": 1, "api_key": "bench"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--throttle-every", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubScorecardServer(total=args.requests) as stub:
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            requests.get(stub.base_url + "schools", params=PARAMS).json()
+        bare = (time.perf_counter() - start) / args.requests
+
+        client = CollegeScorecardClient(api_key="bench", base_url=stub.base_url)
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get_data("schools", dict(PARAMS))
+        pooled = (time.perf_counter() - start) / args.requests
+    print(f"bare requests.get  {bare * 1000:6.2f} ms/request")
+    print(f"pooled session     {pooled * 1000:6.2f} ms/request")
+
+    with StubScorecardServer(total=2000, throttle_every=args.throttle_every) as stub:
+        client = CollegeScorecardClient(
+            api_key="bench", base_url=stub.base_url, backoff=0.01
+        )
+        rows = client.get_all_institutions(fields=["school.name"], max_workers=4)
+    print(
+        f"throttled pull     {len(rows)} rows, {stub.requests} requests, "
+        f"{stub.throttled} answered with 429"
+    )
+
+
+if __name__ == "__main__":
+    main()
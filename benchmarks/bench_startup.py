@@ -0,0 +1,139 @@
+"""Cold-start import cost of each Streamlit app, measured with ``-X importtime``.
+
+For every app (and each antibiotic page) the module-level imports of its
+script are replayed in a fresh interpreter started with ``-X importtime``; the
+cumulative time of every top-level import is summed and the slowest modules
+are listed. Nothing is rendered and no data is fetched, so only the import
+graph is measured.
+
+With ``--budget-ms`` the run exits with status 1 when any app's cold start
+exceeds the budget (also read from ``$STARTUP_BUDGET_MS``), so it can guard
+against import-time regressions in CI. ``tests/test_startup_budget.py`` runs
+the same check under pytest.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--top 10]
+        [--budget-ms 4000] [--json startup.json]
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APPS = {
+    "college_affordability": (
+        ROOT / "termproject" / "src" / "college_affordability_app.py"
+    ),
+    "sf_airbnb_listing": ROOT / "streamlit" / "sf_airbnb_listing.py",
+    "antibiotic": ROOT / "antibiotic" / "antibiotic_app.py",
+    **{
+        f"antibiotic/{page.stem}": page
+        for page in sorted((ROOT / "antibiotic" / "pages").glob("*.py"))
+    },
+}
+
+def _script_dir(path):
+    """Directory ``streamlit run`` puts first on ``sys.path`` for ``path``."""
+    # Pages of a multipage app run with the main script's directory.
+    return path.parent.parent if path.parent.name == "pages" else path.parent
+
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_script(path):
+    """
+    Return Python source replaying the module-level imports of ``path``
+
+    ``sys.path`` is set up as ``streamlit run`` would (the main script's
+    directory first, then the repository root the apps append themselves).
+    """
+    tree = ast.parse(path.read_text())
+    imports = [
+        ast.unparse(node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    return "\n".join(
+        [
+            "import sys",
+            f"sys.path.insert(0, {str(_script_dir(path))!r})",
+            f"sys.path.append({str(ROOT)!r})",
+            *imports,
+        ]
+    )
+
+
+def measure(path):
+    """
+    Import ``path``'s dependencies once in a fresh interpreter
+
+    Returns:
+        dict: ``total_ms`` and ``modules`` (top-level name -> cumulative ms)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", import_script(path)],
+        capture_output=True,
+        text=True,
+        cwd=_script_dir(path),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{path} failed to import:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        # Depth is the indentation of the module name; keep top-level imports.
+        if match and len(match.group(3)) == 1:
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    return {"total_ms": sum(modules.values()), "modules": modules}
+
+
+def profile(apps, repeat):
+    """Best of ``repeat`` runs per app; the first run also warms the OS cache."""
+    results = {}
+    for name, path in apps.items():
+        runs = [measure(path) for _ in range(repeat)]
+        results[name] = min(runs, key=lambda run: run["total_ms"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument(
+        "--budget-ms", type=float, default=os.getenv("STARTUP_BUDGET_MS")
+    )
+    parser.add_argument("--json", default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    results = profile({name: APPS[name] for name in args.apps}, args.repeat)
+    for name, result in results.items():
+        print(f"{name:45s} {result['total_ms']:8.1f} ms")
+        slowest = sorted(result["modules"].items(), key=lambda item: -item[1])
+        for module, ms in slowest[: args.top]:
+            print(f"    {module:41s} {ms:8.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    budget = args.budget_ms
+    if budget is not None:
+        over = {n: r["total_ms"] for n, r in results.items() if r["total_ms"] > budget}
+        for name, total in over.items():
+            print(f"OVER BUDGET: {name} {total:.1f} ms > {budget:.0f} ms")
+        if over:
+            sys.exit(1)
+        print(f"All apps start within {budget:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Local stand-in for the College Scorecard ``schools`` endpoint.
+
+The stub serves deterministic, Scorecard-shaped records for whatever dotted
+``fields`` are requested, honours ``page``/``per_page`` and reports
+``metadata.total`` the way the real API does. An artificial per-request latency
+makes the cost of serial pagination visible without touching the network, and
+``throttle_every`` injects 429 responses with api.data.gov's rate-limit headers.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STATES = ["CA", "TX", "FL", "NY", "PA", "IL", "OH", "GA", "NC", "MI", "MA", "WA"]
+
+
+def make_record(index, fields):
+    """Build one institution record containing the requested dotted fields."""
+    rng = random.Random(index)
+    record = {}
+    for field in fields:
+        if field == "id":
+            record[field] = 100000 + index
+        elif field == "school.name":
+            record[field] = f"Institution {index}"
+        elif field == "school.state":
+            record[field] = STATES[index % len(STATES)]
+        elif field in ("school.ownership", "school.control"):
+            record[field] = 1 + index % 3
+        elif field == "school.region_id":
+            record[field] = 1 + index % 9
+        elif ".race_ethnicity." in field or field.endswith("first_generation"):
+            record[field] = round(rng.random(), 4)
+        elif field.endswith("student.size"):
+            record[field] = rng.randint(50, 60000)
+        elif rng.random() < 0.1:
+            record[field] = None
+        else:
+            record[field] = rng.randint(3000, 80000)
+    return record
+
+
+class StubScorecardServer:
+    """Threaded HTTP server that mimics ``/schools`` pagination.
+
+    Args:
+        total (int): Number of institutions the endpoint reports
+        latency (float): Seconds to sleep before answering each request
+        throttle_every (int): Answer every Nth request with a 429 (0 disables)
+        hourly_limit (int): Value reported in ``X-RateLimit-Limit``
+    """
+
+    def __init__(self, total=6500, latency=0.0, throttle_every=0, hourly_limit=1000):
+        self.total = total
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.hourly_limit = hourly_limit
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def send_rate_limit_headers(self, handler):
+        remaining = max(0, self.hourly_limit - self.requests)
+        handler.send_header("X-RateLimit-Limit", str(self.hourly_limit))
+        handler.send_header("X-RateLimit-Remaining", str(remaining))
+
+    def throttle(self, handler):
+        """Write a 429 the way api.data.gov does when a key is over quota."""
+        body = b'{"error": {"code": "OVER_RATE_LIMIT"}}'
+        handler.send_response(429)
+        handler.send_header("Retry-After", "0")
+        self.send_rate_limit_headers(handler)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def respond(self, handler, query):
+        """Write the JSON page for ``query`` to ``handler``."""
+        page = int(query.get("page", ["0"])[0])
+        per_page = int(query.get("per_page", ["20"])[0])
+        fields = query.get("fields", [""])[0].split(",")
+        matches = range(self.total)
+        if "school.state" in query:
+            state = query["school.state"][0]
+            matches = [i for i in matches if STATES[i % len(STATES)] == state]
+        if "school.ownership" in query:
+            ownership = int(query["school.ownership"][0])
+            matches = [i for i in matches if 1 + i % 3 == ownership]
+        selected = matches[page * per_page : (page + 1) * per_page]
+        body = json.dumps(
+            {
+                "metadata": {"total": len(matches), "page": page, "per_page": per_page},
+                "results": [make_record(i, fields) for i in selected],
+            }
+        ).encode()
+        handler.send_response(200)
+        self.send_rate_limit_headers(handler)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY a
+            # keep-alive client waits on delayed ACKs for every response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    throttled = (
+                        stub.throttle_every and stub.requests % stub.throttle_every == 0
+                    )
+                    stub.throttled += bool(throttled)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if throttled:
+                    stub.throttle(self)
+                else:
+                    stub.respond(self, parse_qs(urlparse(self.path).query))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
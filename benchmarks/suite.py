@@ -0,0 +1,273 @@
+"""Stage-by-stage benchmark suite for the three apps, on synthetic data.
+
+``run`` times each stage in isolation at one or more scales:
+
+* scorecard - load records, prepare cost/enrollment frames, index, filter by
+  state/ownership, build and roll up the cube, build a chart spec;
+* airbnb - stream a listings CSV into its Parquet partition, load it, build
+  the filter index, filter, hex-bin, build a chart spec;
+* antibiogram - build the MIC matrix, melt, score outliers, group means,
+  build a chart spec.
+
+Inputs come from ``benchmarks/synthetic.py`` and are deterministic, so runs are
+comparable; everything runs offline. Results are written as JSON, and
+``compare`` reports the per-stage change between two result files.
+
+Usage:
+    python benchmarks/suite.py run [--scales small medium large]
+        [--apps scorecard airbnb antibiogram] [--repeat 5] [--out results.json]
+    python benchmarks/suite.py compare base.json new.json [--threshold 1.10]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "termproject" / "src"))
+sys.path.insert(0, str(ROOT / "streamlit"))
+sys.path.insert(0, str(ROOT / "antibiotic"))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import (  # noqa: E402
+    antibiogram_frame,
+    scorecard_records,
+    write_listings_csv,
+)
+
+SCALES = {
+    "small": {"scorecard": 1_000, "airbnb": 1_000, "antibiogram": (1_000, 20)},
+    "medium": {
+        "scorecard": 6_500,
+        "airbnb": 100_000,
+        "antibiogram": (10_000, 100),
+    },
+    "large": {
+        "scorecard": 20_000,
+        "airbnb": 1_000_000,
+        "antibiogram": (50_000, 300),
+    },
+}
+DEFAULT_WORKDIR = ROOT / "benchmarks" / "data"
+
+
+class Run:
+    """Collects per-stage timings for one app at one scale."""
+
+    def __init__(self, app, scale, repeat, results):
+        self.app = app
+        self.scale = scale
+        self.repeat = repeat
+        self.results = results
+
+    def stage(self, name, fn):
+        """Call ``fn`` ``repeat`` times, record its timings and return its value."""
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            value = fn()
+            times.append(time.perf_counter() - start)
+        rows = len(value) if hasattr(value, "__len__") else None
+        self.results.append(
+            {
+                "app": self.app,
+                "scale": self.scale,
+                "stage": name,
+                "median_s": statistics.median(times),
+                "min_s": min(times),
+                "rows": rows,
+            }
+        )
+        print(
+            f"{self.app:12s} {self.scale:8s} {name:10s} "
+            f"{statistics.median(times) * 1000:10.2f} ms  rows={rows}"
+        )
+        return value
+
+
+def bench_scorecard(run, rows, workdir):
+    from cube import build_cube, rollup
+    from data import prepare_base, prepare_cost_data, prepare_enrollment_data
+    from institution_index import InstitutionIndex
+    from snapshot import YEARS, frame_to_long
+    from visuals import cost_bar_chart
+
+    year = YEARS[-1]
+    records = scorecard_records(rows, [year])
+    df = run.stage("load", lambda: pd.DataFrame.from_records(records))
+
+    def prepare():
+        base = prepare_base(df, year)
+        return (
+            prepare_cost_data(df, year, base=base),
+            prepare_enrollment_data(df, year, base=base),
+        )
+
+    (_, _, avg_cost), _ = run.stage("prepare", prepare)
+    index = run.stage("index", lambda: InstitutionIndex(df))
+    run.stage("filter", lambda: index.select(states=["CA", "TX"], ownership=1))
+    run.stage(
+        "aggregate",
+        lambda: rollup(build_cube(frame_to_long(df, year), year), states=["CA"]),
+    )
+    run.stage("chart-spec", lambda: cost_bar_chart(avg_cost, year).to_dict())
+
+
+def bench_airbnb(run, rows, workdir):
+    from airbnb_data import ingest_listings, load_snapshot, snapshot_parts
+    from binning import listing_bins
+    from listing_filter import ListingFilter
+
+    # The path mimics Inside Airbnb's .../<city>/<date>/data/ layout.
+    city = f"synthetic-{rows}"
+    source = write_listings_csv(
+        workdir / "csv" / city / "2025-01-01" / "data" / "listings.csv.gz", rows
+    )
+    data = workdir / "airbnb"
+    run.stage("ingest", lambda: ingest_listings(str(source), directory=data))
+    df = run.stage(
+        "load", lambda: load_snapshot(*snapshot_parts(str(source)), directory=data)
+    )
+    listing_filter = run.stage("index", lambda: ListingFilter(df))
+    run.stage(
+        "filter",
+        lambda: listing_filter.select(
+            value_range=(50, 300), room_type="Private room"
+        ).columns(["longitude", "latitude", "price", "room_type"]),
+    )
+    bins = run.stage("aggregate", lambda: listing_bins(df, "hex"))
+    run.stage(
+        "chart-spec",
+        lambda: alt.Chart(bins)
+        .mark_point(shape="square", filled=True)
+        .encode(
+            longitude="longitude:Q",
+            latitude="latitude:Q",
+            size="count:Q",
+            color="median_price:Q",
+        )
+        .to_dict(),
+    )
+
+
+def bench_antibiogram(run, shape, workdir):
+    from antibiogram import Antibiogram
+    from outliers import OutlierScores
+
+    isolates, drugs = shape
+    frame = antibiogram_frame(isolates, drugs)
+    antibiogram = run.stage("load", lambda: Antibiogram.from_frame(frame))
+    selected = antibiogram.drugs[:8]
+    run.stage("prepare", lambda: antibiogram.melted(selected))
+    scores = run.stage("outliers", lambda: OutlierScores(antibiogram))
+    run.stage("filter", lambda: scores.flagged(selected[0]))
+    means = run.stage("aggregate", lambda: antibiogram.group_means())
+    run.stage(
+        "chart-spec",
+        lambda: alt.Chart(means)
+        .mark_bar()
+        .encode(x="Antibiotic:N", y="MIC:Q", color="Gram_Staining:N")
+        .to_dict(),
+    )
+
+
+BENCHMARKS = {
+    "scorecard": bench_scorecard,
+    "airbnb": bench_airbnb,
+    "antibiogram": bench_antibiogram,
+}
+
+
+def run_suite(scales, apps, repeat, workdir):
+    alt.data_transformers.disable_max_rows()
+    results = []
+    for scale in scales:
+        for app in apps:
+            run = Run(app, scale, repeat, results)
+            BENCHMARKS[app](run, SCALES[scale][app], workdir)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": repeat,
+            "sizes": {scale: SCALES[scale] for scale in scales},
+        },
+        "results": results,
+    }
+
+
+def _key(row):
+    return row["app"], row["scale"], row["stage"]
+
+
+def compare(base, new, threshold):
+    """
+    Print the per-stage change from ``base`` to ``new``
+
+    Returns:
+        list: ``(app, scale, stage, ratio)`` for stages slower than ``threshold``
+    """
+    before = {_key(row): row["median_s"] for row in base["results"]}
+    regressions = []
+    for row in new["results"]:
+        old = before.get(_key(row))
+        if old is None:
+            continue
+        ratio = row["median_s"] / old if old else float("inf")
+        marker = "  SLOWER" if ratio > threshold else ""
+        print(
+            f"{row['app']:12s} {row['scale']:8s} {row['stage']:10s} "
+            f"{old * 1000:10.2f} -> {row['median_s'] * 1000:10.2f} ms "
+            f"x{ratio:5.2f}{marker}"
+        )
+        if ratio > threshold:
+            regressions.append((*_key(row), ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    run_parser = subcommands.add_parser("run", help="time every stage")
+    run_parser.add_argument(
+        "--scales", nargs="+", choices=list(SCALES), default=["small"]
+    )
+    run_parser.add_argument(
+        "--apps", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--out", default="benchmark-results.json")
+    run_parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    compare_parser = subcommands.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=1.10)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(args.scales, args.apps, args.repeat, args.workdir)
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        print(f"Wrote {len(results['results'])} timings to {args.out}")
+    elif args.command == "compare":
+        base = json.loads(Path(args.base).read_text())
+        new = json.loads(Path(args.new).read_text())
+        regressions = compare(base, new, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than x{args.threshold:.2f}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Deterministic synthetic inputs for the benchmark suite.
+
+Every generator takes a ``seed`` and returns the same data for the same
+arguments, so timings from different runs and machines compare like for like.
+Nothing is downloaded.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "termproject" / "src"))
+
+from collegescore import SCHOOL_FIELDS, YEAR_METRICS  # noqa: E402
+
+STATES = ["CA", "TX", "NY", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
+ROOM_TYPES = ["Entire home/apt", "Private room", "Shared room", "Hotel room"]
+GRAM_TYPES = ["positive", "negative"]
+# Doubling-dilution MICs as labs report them.
+DILUTIONS = 2.0 ** np.arange(-6, 9)
+
+
+def scorecard_records(rows, years, seed=0):
+    """
+    Scorecard API results: one dict per institution with dotted field names
+
+    Args:
+        rows (int): Institutions
+        years (list): Years whose ``f"{year}.{metric}"`` fields are included
+        seed (int): RNG seed
+
+    Returns:
+        list: Records as ``client.get_all_institutions`` returns them
+    """
+    rng = np.random.default_rng(seed)
+    columns = {
+        "id": np.arange(100000, 100000 + rows),
+        "school.name": [f"Institution {i}" for i in range(rows)],
+        "school.state": rng.choice(STATES, rows),
+        "school.control": rng.integers(1, 4, rows),
+        "school.region_id": rng.integers(1, 10, rows),
+        "school.ownership": rng.integers(1, 4, rows),
+    }
+    for year in years:
+        for metric in YEAR_METRICS:
+            if metric.startswith("cost."):
+                values = rng.integers(3000, 80000, rows).astype(float)
+            elif metric == "student.size":
+                values = rng.integers(0, 60000, rows).astype(float)
+            else:
+                values = rng.random(rows).round(4)
+            values[rng.random(rows) < 0.1] = np.nan
+            columns[f"{year}.{metric}"] = values
+    frame = pd.DataFrame(columns)[
+        SCHOOL_FIELDS + [f"{y}.{m}" for y in years for m in YEAR_METRICS]
+    ]
+    # JSON has nulls, not NaN.
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def listings_frame(rows, seed=0, neighbourhoods=40):
+    """
+    Inside Airbnb-shaped listings, prices formatted as ``"$1,234.00"``
+
+    Coordinates cluster around San Francisco; a few unused columns are
+    included so column pruning has something to prune.
+    """
+    rng = np.random.default_rng(seed)
+    price = np.exp(rng.normal(5.2, 0.8, rows)).round(0)
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, rows + 1, dtype=np.int64) * 7919,
+            "listing_url": [f"https://example.invalid/rooms/{i}" for i in range(rows)],
+            "name": [f"Listing {i}" for i in range(rows)],
+            "description": "Synthetic listing",
+            "neighbourhood": rng.integers(0, neighbourhoods, rows).astype(str),
+            "room_type": rng.choice(ROOM_TYPES, rows, p=[0.6, 0.3, 0.05, 0.05]),
+            "latitude": 37.76 + rng.normal(0, 0.025, rows),
+            "longitude": -122.44 + rng.normal(0, 0.03, rows),
+            "price": [f"${value:,.2f}" for value in price],
+            "number_of_reviews": rng.poisson(25, rows),
+            "host_about": "",
+        }
+    )
+
+
+def write_listings_csv(path, rows, seed=0):
+    """Write ``listings_frame(rows, seed)`` to ``path`` (gzip by suffix)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        listings_frame(rows, seed).to_csv(path, index=False, compression="infer")
+    return path
+
+
+def antibiogram_frame(isolates, drugs, seed=0, organisms=200, untested=0.2):
+    """
+    Wide antibiogram export: one row per isolate, one MIC column per drug
+
+    MICs are doubling dilutions, some reported as ``"<=0.016"``/``">256"``,
+    and ``untested`` of them are missing.
+    """
+    rng = np.random.default_rng(seed)
+    organism = rng.integers(0, organisms, isolates)
+    frame = {
+        "Isolate": np.arange(isolates),
+        "Bacteria": pd.Categorical.from_codes(
+            organism, categories=[f"Organism {i}" for i in range(organisms)]
+        ),
+        "Gram_Staining": pd.Categorical.from_codes(
+            organism % 2, categories=GRAM_TYPES
+        ),
+    }
+    # Each organism x drug pair has its own typical dilution.
+    typical = rng.integers(0, len(DILUTIONS), (organisms, drugs))
+    for j in range(drugs):
+        steps = typical[organism, j] + rng.integers(-1, 2, isolates)
+        values = DILUTIONS[np.clip(steps, 0, len(DILUTIONS) - 1)].astype(object)
+        values[steps <= 0] = "<=0.016"
+        values[steps >= len(DILUTIONS) - 1] = ">256"
+        values[rng.random(isolates) < untested] = None
+        frame[f"Drug {j:03d}"] = values
+    return pd.DataFrame(frame)
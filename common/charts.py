@@ -0,0 +1,165 @@
+"""
+Shared Altair rendering for the Streamlit apps in this repository.
+
+``render_chart`` trims every pandas dataset in a chart down to the columns its
+encodings and transforms actually reference before handing it to
+``st.altair_chart``. When profiling is on (see ``common.perf``), it also
+records the size of what is shipped to the browser.
+``enable_vegafusion`` switches Altair to the VegaFusion data transformer for
+charts saved or displayed outside Streamlit. Rendering is timed as a
+``chart:<name>`` span.
+"""
+
+import importlib.util
+import logging
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from common.perf import span
+
+logger = logging.getLogger(__name__)
+
+# name -> {"rows", "columns", "bytes"} of the data embedded in the last
+# profiled render.
+CHART_SIZES = {}
+
+# Transforms whose expressions may reference fields we cannot see.
+_EXPRESSION_TRANSFORMS = {"calculate", "filter", "joinaggregate", "window", "lookup"}
+
+
+def enable_vegafusion():
+    """
+    Enable Altair's VegaFusion data transformer when it is installed
+
+    ``st.altair_chart`` swaps in its own Arrow transformer while serialising,
+    so this has no effect on charts rendered in the apps: it covers charts
+    saved or displayed outside Streamlit. Inside the apps, aggregation stays
+    with the data layer, e.g. the listing app's ``binning`` module and the
+    Scorecard cube.
+
+    Availability is checked without importing VegaFusion, which is only loaded
+    when a chart is first transformed.
+
+    Returns:
+        bool: True if VegaFusion is available
+    """
+    if importlib.util.find_spec("vegafusion") is None:
+        return False
+    alt.data_transformers.enable("vegafusion")
+    return True
+
+
+def _collect_fields(spec, fields):
+    if isinstance(spec, dict):
+        for key, value in spec.items():
+            if key == "field" and isinstance(value, str):
+                fields.add(value)
+            elif key in ("groupby", "fields") and isinstance(value, list):
+                fields.update(v for v in value if isinstance(v, str))
+            else:
+                _collect_fields(value, fields)
+    elif isinstance(spec, list):
+        for item in spec:
+            _collect_fields(item, fields)
+
+
+def _referenced_fields(chart, data):
+    """Return the columns ``chart`` references, or None if they are unknowable."""
+    fields = set()
+    context = {"data": data}
+    if chart.encoding is not alt.Undefined:
+        _collect_fields(chart.encoding.to_dict(validate=False, context=context), fields)
+    if chart.transform is not alt.Undefined:
+        for transform in chart.transform:
+            transform = transform.to_dict(validate=False)
+            if _EXPRESSION_TRANSFORMS & transform.keys():
+                return None
+            _collect_fields(transform, fields)
+    return fields
+
+
+def _project(chart):
+    """Return a copy of ``chart`` whose DataFrames keep only referenced columns."""
+    if isinstance(chart, alt.LayerChart):
+        chart = chart.copy(deep=False)
+        data = chart.data
+        if isinstance(data, pd.DataFrame):
+            fields = set()
+            for layer in chart.layer:
+                if layer.data is not alt.Undefined:
+                    continue
+                layer_fields = _referenced_fields(layer, data)
+                if layer_fields is None:
+                    fields = None
+                    break
+                fields |= layer_fields
+            if fields:
+                chart.data = data[[c for c in data.columns if c in fields]]
+        chart.layer = [_project(layer) for layer in chart.layer]
+        return chart
+
+    data = getattr(chart, "data", alt.Undefined)
+    if not isinstance(data, pd.DataFrame) or not isinstance(chart, alt.Chart):
+        return chart
+    fields = _referenced_fields(chart, data)
+    if not fields:
+        return chart
+    chart = chart.copy(deep=False)
+    chart.data = data[[c for c in data.columns if c in fields]]
+    return chart
+
+
+def _frames(chart):
+    data = getattr(chart, "data", alt.Undefined)
+    if isinstance(data, pd.DataFrame):
+        yield data
+    for layer in getattr(chart, "layer", None) or []:
+        yield from _frames(layer)
+
+
+def payload_size(chart):
+    """
+    Measure the data a chart embeds, as Streamlit ships it (Arrow)
+
+    Args:
+        chart (alt.TopLevelMixin): Chart to measure
+
+    Returns:
+        dict: ``rows``, ``columns`` and ``bytes`` summed over its DataFrames
+    """
+    rows = columns = size = 0
+    for frame in _frames(chart):
+        rows += len(frame)
+        columns += frame.shape[1]
+        size += pa.Table.from_pandas(frame, preserve_index=False).nbytes
+    return {"rows": rows, "columns": columns, "bytes": size}
+
+
+def render_chart(chart, name=None, **kwargs):
+    """
+    Project a chart's data to its encoded columns and draw it with Streamlit
+
+    Args:
+        chart (alt.TopLevelMixin): Chart to draw
+        name (str): Label the span and payload size are recorded under;
+            defaults to the chart title
+        **kwargs: Passed to ``st.altair_chart``
+
+    Returns:
+        The Streamlit element returned by ``st.altair_chart``
+    """
+    chart = _project(chart)
+    if name is None:
+        title = getattr(chart, "title", alt.Undefined)
+        name = title if isinstance(title, str) else f"chart {len(CHART_SIZES) + 1}"
+    chart_span = span(f"chart:{name}")
+    if chart_span.active:
+        # Serialising the data to Arrow costs time; only measure when profiling.
+        size = CHART_SIZES[name] = payload_size(chart)
+        logger.debug("%s: %s", name, size)
+        chart_span.record(rows=size["rows"], nbytes=size["bytes"])
+    with chart_span:
+        return st.altair_chart(chart, **kwargs)
@@ -0,0 +1,223 @@
+"""
+Per-rerun timing spans for the Streamlit apps.
+
+Off by default. With ``PERF_SPANS=1`` in the environment, or ``?perf=1`` in
+the app URL, every ``span`` records wall time, rows and bytes for one stage of
+the current rerun. ``show_panel`` lists them in a sidebar expander and emits
+each as a JSON line, appended to ``$PERF_LOG`` when set and logged otherwise.
+
+Fragment reruns skip the script body, so ``fragment_run`` wraps each
+``st.fragment`` function: it collects that function's spans when it reruns on
+its own and lists them in the fragment's own container.
+
+When off, ``span`` returns a shared no-op context manager, so instrumented code
+pays one attribute lookup per stage.
+"""
+
+import contextlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_reruns = itertools.count(1)
+
+
+class _NullSpan:
+    active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def record(self, value=None, rows=None, nbytes=None, **fields):
+        return value
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Times one stage of a rerun; use as a context manager
+
+    Args:
+        name (str): Stage name, e.g. ``"fetch"`` or ``"chart:Price"``
+        spans (list): Rerun's span records, appended to on exit
+        origin (float): ``perf_counter`` at the start of the rerun
+    """
+
+    __slots__ = ("name", "spans", "origin", "start", "rows", "nbytes", "fields")
+    # False on the no-op span, so callers can skip measuring sizes.
+    active = True
+
+    def __init__(self, name, spans, origin):
+        self.name = name
+        self.spans = spans
+        self.origin = origin
+        self.rows = None
+        self.nbytes = None
+        self.fields = {}
+
+    def record(self, value=None, rows=None, nbytes=None, **fields):
+        """
+        Attach the stage's output size; returns ``value`` unchanged
+
+        DataFrames report their length and shallow memory usage; other sized
+        objects their length. Explicit ``rows``/``nbytes`` take precedence.
+        Extra keyword ``fields``, such as memo counters, are added to the
+        span's record as they are.
+        """
+        if isinstance(value, pd.DataFrame):
+            self.rows = len(value)
+            self.nbytes = int(value.memory_usage(index=False).sum())
+        elif hasattr(value, "__len__"):
+            self.rows = len(value)
+        if rows is not None:
+            self.rows = rows
+        if nbytes is not None:
+            self.nbytes = nbytes
+        self.fields.update(fields)
+        return value
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.spans.append(
+            {
+                "span": self.name,
+                "start_ms": (self.start - self.origin) * 1000,
+                "ms": (end - self.start) * 1000,
+                "rows": self.rows,
+                "bytes": self.nbytes,
+                **self.fields,
+            }
+        )
+        return False
+
+
+def enabled():
+    """True when spans are requested by environment or query parameter."""
+    if os.getenv("PERF_SPANS", "") not in ("", "0"):
+        return True
+    try:
+        return st.query_params.get("perf") == "1"
+    except Exception:
+        return False
+
+
+def start_rerun(app):
+    """Begin collecting spans for this rerun of ``app`` if profiling is on."""
+    _local.spans = [] if enabled() else None
+    _local.app = app
+    _local.origin = time.perf_counter()
+
+
+def span(name):
+    """
+    Return a context manager timing stage ``name`` of the current rerun
+
+    Example:
+        with span("prepare") as s:
+            frame = s.record(prepare(df))
+    """
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        return NULL_SPAN
+    return Span(name, spans, _local.origin)
+
+
+def _emit(records):
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    path = os.getenv("PERF_LOG")
+    if path:
+        with open(path, "a") as log:
+            log.write(lines)
+    else:
+        for line in lines.splitlines():
+            logger.info(line)
+
+
+def _finish():
+    """End the current rerun; return its records, spans and total time."""
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        return None
+    _local.spans = None
+    rerun = next(_reruns)
+    total_ms = (time.perf_counter() - _local.origin) * 1000
+    timestamp = time.time()
+    records = [
+        {"app": _local.app, "rerun": rerun, "ts": timestamp, **record}
+        for record in spans
+    ]
+    _emit(records)
+    return records, spans, total_ms, rerun
+
+
+def _render(target, title, spans, total_ms, rerun):
+    with target.expander(f"{title} ({total_ms:,.0f} ms)", expanded=False):
+        if spans:
+            st.dataframe(
+                pd.DataFrame(spans).sort_values("start_ms"),
+                hide_index=True,
+                use_container_width=True,
+            )
+        st.caption(f"Rerun {rerun}: {len(spans)} spans, {total_ms:,.1f} ms total")
+
+
+def show_panel():
+    """
+    End the rerun: emit its spans as JSON lines and list them in the sidebar
+
+    Returns:
+        list: Span records of this rerun; empty when profiling is off
+    """
+    finished = _finish()
+    if finished is None:
+        return []
+    records, spans, total_ms, rerun = finished
+    _render(st.sidebar, "Performance", spans, total_ms, rerun)
+    return records
+
+
+@contextlib.contextmanager
+def fragment_run(name):
+    """
+    Time an ``st.fragment`` function; use as a decorator under ``@st.fragment``
+
+    During a full rerun the fragment's spans join the rerun's. When the
+    fragment reruns on its own, they are collected as a rerun of ``name``,
+    emitted, and listed in the fragment's container, since fragments cannot
+    write to the sidebar.
+
+    Example:
+        @st.fragment
+        @fragment_run("college_affordability:debt")
+        def debt_section():
+            ...
+    """
+    if getattr(_local, "spans", None) is not None:
+        yield
+        return
+    start_rerun(name)
+    try:
+        yield
+    finally:
+        finished = _finish()
+        if finished is not None:
+            _, spans, total_ms, rerun = finished
+            _render(st, f"Performance: {name}", spans, total_ms, rerun)
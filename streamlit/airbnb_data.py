@@ -0,0 +1,226 @@
+"""
+Column-pruned, typed loader for Inside Airbnb ``listings.csv.gz`` files.
+
+``python airbnb_data.py ingest URL [URL ...]`` streams each CSV in chunks,
+parsing only the columns the dashboard uses, cleaning prices and dropping
+outliers chunk by chunk, and appends the rows to a Parquet dataset
+partitioned as ``listings/city=<city>/date=<snapshot date>/``. Readers load
+one partition at a time, so memory does not grow with the number of cities
+and snapshots ingested.
+"""
+
+import argparse
+import os
+import re
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+LISTING_COLUMNS = [
+    "id",
+    "name",
+    "neighbourhood",
+    "room_type",
+    "latitude",
+    "longitude",
+    "price",
+    "number_of_reviews",
+]
+LISTING_DTYPES = {
+    "id": "int64",
+    "name": "string",
+    "neighbourhood": "category",
+    "room_type": "category",
+    "latitude": "float32",
+    "longitude": "float32",
+    "price": "string",
+    "number_of_reviews": "float32",
+}
+CATEGORY_COLUMNS = ["neighbourhood", "room_type"]
+# Categories are read as strings so every chunk shares one Parquet schema.
+CSV_DTYPES = {**LISTING_DTYPES, **{column: "string" for column in CATEGORY_COLUMNS}}
+# Arrow type per column of the ingested dataset.
+LISTING_SCHEMA = [
+    ("id", "int64"),
+    ("name", "string"),
+    ("neighbourhood", "string"),
+    ("room_type", "string"),
+    ("latitude", "float32"),
+    ("longitude", "float32"),
+    ("price", "float32"),
+    ("number_of_reviews", "float32"),
+]
+PRICE_RANGE = (10, 1000)
+CHUNK_ROWS = 20_000
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / "data"
+DATASET = "listings"
+PART_FILE = "part-0.parquet"
+# Written last into each partition; readers skip files starting with "_".
+SOURCE_FILE = "_source.txt"
+
+_SNAPSHOT_URL = re.compile(r"/([^/]+)/(\d{4}-\d{2}-\d{2})/")
+
+
+def data_dir(directory=None):
+    return Path(directory or os.getenv("AIRBNB_DATA_DIR") or DEFAULT_DATA_DIR)
+
+
+def snapshot_parts(url):
+    """
+    Return the ``(city, snapshot date)`` of a listings URL
+
+    ``.../united-states/ca/san-francisco/2025-03-01/data/listings.csv.gz``
+    gives ``("san-francisco", "2025-03-01")``.
+    """
+    match = _SNAPSHOT_URL.search(url)
+    if match is None:
+        raise ValueError(f"Cannot find a city/date snapshot in {url!r}")
+    return match.group(1), match.group(2)
+
+
+def snapshot_key(url):
+    """Name a listings URL by city and date, e.g. ``san-francisco-2025-03-01``."""
+    return "-".join(snapshot_parts(url))
+
+
+def partition_dir(city, date, directory=None):
+    return data_dir(directory) / DATASET / f"city={city}" / f"date={date}"
+
+
+def parse_price(values):
+    """Convert ``"$1,234.00"`` strings to float32 in one vectorized pass."""
+    cleaned = values.str.replace(r"[$,]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").astype("float32")
+
+
+def clean_listings(df):
+    """Parse prices and drop listings outside ``PRICE_RANGE``."""
+    if df["price"].dtype != "float32":
+        df["price"] = parse_price(df["price"].astype("string"))
+    return df[df["price"].between(*PRICE_RANGE)].reset_index(drop=True)
+
+
+def read_listings_csv(source, chunksize=None):
+    """
+    Read only ``LISTING_COLUMNS`` of a listings CSV with compact dtypes
+
+    With ``chunksize`` an iterator of frames is returned instead of one frame.
+    """
+    return pd.read_csv(
+        source,
+        compression="infer",
+        usecols=LISTING_COLUMNS,
+        dtype=CSV_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def ingest_listings(url, directory=None, chunksize=CHUNK_ROWS):
+    """
+    Stream ``url`` into its ``city``/``date`` partition, replacing it
+
+    At most ``chunksize`` rows are held in memory at a time. The partition is
+    written to a temporary directory and swapped in when complete.
+
+    Args:
+        url (str): Inside Airbnb ``listings.csv.gz`` URL
+        directory (str | Path): Data directory; defaults to
+            ``$AIRBNB_DATA_DIR`` or ``streamlit/data``
+        chunksize (int): CSV rows parsed per chunk
+
+    Returns:
+        int: Number of listings kept
+    """
+    # Only ingestion writes Parquet directly; keep the writer out of app startup.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [(name, pa.type_for_alias(arrow_type)) for name, arrow_type in LISTING_SCHEMA]
+    )
+    path = partition_dir(*snapshot_parts(url), directory)
+    tmp = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    rows = 0
+    with pq.ParquetWriter(tmp / PART_FILE, schema) as writer:
+        for chunk in read_listings_csv(url, chunksize=chunksize):
+            chunk = clean_listings(chunk)
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            )
+            rows += len(chunk)
+    (tmp / SOURCE_FILE).write_text(url)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return rows
+
+
+def available_snapshots(directory=None):
+    """
+    List the ingested snapshots
+
+    Returns:
+        dict: city -> {snapshot date -> source URL}, dates in ascending order
+    """
+    snapshots = {}
+    root = data_dir(directory) / DATASET
+    for source in sorted(root.glob(f"city=*/date=*/{SOURCE_FILE}")):
+        partition = source.parent
+        if partition.suffix == ".tmp":
+            continue
+        city = partition.parent.name.split("=", 1)[1]
+        date = partition.name.split("=", 1)[1]
+        snapshots.setdefault(city, {})[date] = source.read_text().strip()
+    return snapshots
+
+
+def load_snapshot(city, date, directory=None):
+    """
+    Read one ingested ``city``/``date`` partition
+
+    Returns:
+        pd.DataFrame: Listings with category/float32 columns
+    """
+    listings = pd.read_parquet(partition_dir(city, date, directory) / PART_FILE)
+    return listings.astype({column: "category" for column in CATEGORY_COLUMNS})
+
+
+def load_listings(url, directory=None):
+    """
+    Load cleaned listings for ``url``, ingesting its partition on first use
+
+    Args:
+        url (str): Inside Airbnb ``listings.csv.gz`` URL
+        directory (str | Path): Data directory; defaults to
+            ``$AIRBNB_DATA_DIR`` or ``streamlit/data``
+
+    Returns:
+        pd.DataFrame: Listings with category/float32 columns
+    """
+    city, date = snapshot_parts(url)
+    if not (partition_dir(city, date, directory) / SOURCE_FILE).exists():
+        ingest_listings(url, directory)
+    return load_snapshot(city, date, directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inside Airbnb listings dataset")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subcommands.add_parser("ingest", help="download and write")
+    ingest_parser.add_argument("urls", nargs="+", help="listings.csv.gz URLs")
+    ingest_parser.add_argument("--dir", default=None, help="data directory")
+    ingest_parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        for url in args.urls:
+            rows = ingest_listings(url, directory=args.dir, chunksize=args.chunksize)
+            print(f"Wrote {rows} listings for {snapshot_key(url)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Server-side binning of listings for the map and the price histogram.
+
+Coordinates are assigned to square or hexagonal cells with NumPy and reduced
+to one row per occupied cell (centre, listing count, median price), so the map
+draws at most one mark per cell however many listings are selected.
+``map_mode`` switches from points to bins above a configurable row threshold.
+``price_histogram`` counts prices per bin and category the same way, so the
+histogram ships one row per bar instead of one per listing.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Cell size in degrees of latitude; ~350 m.
+DEFAULT_CELL_SIZE = 0.004
+SQRT3 = np.sqrt(3.0)
+# Above this many listings the map draws cells instead of points.
+DEFAULT_POINT_THRESHOLD = 5000
+
+
+def _cell_medians(keys, values):
+    """Return (unique keys, counts, medians) of ``values`` grouped by ``keys``."""
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    lower = values[starts + (counts - 1) // 2]
+    upper = values[starts + counts // 2]
+    return unique, counts, (lower + upper) / 2
+
+
+def _projected(longitude, latitude):
+    """Scale longitude by cos(latitude) so cells are roughly square on the map."""
+    lon = np.asarray(longitude, dtype="float64")
+    lat = np.asarray(latitude, dtype="float64")
+    scale = np.cos(np.deg2rad(np.nanmean(lat))) if len(lat) else 1.0
+    return lon * scale, lat, scale
+
+
+def _frame(lon, lat, counts, medians):
+    return pd.DataFrame(
+        {
+            "longitude": lon.astype("float32"),
+            "latitude": lat.astype("float32"),
+            "count": counts.astype("int32"),
+            "median_price": medians.astype("float32"),
+        }
+    )
+
+
+def _valid(longitude, latitude, price):
+    lon = np.asarray(longitude, dtype="float64")
+    lat = np.asarray(latitude, dtype="float64")
+    price = np.asarray(price, dtype="float64")
+    keep = np.isfinite(lon) & np.isfinite(lat) & np.isfinite(price)
+    return lon[keep], lat[keep], price[keep]
+
+
+def square_bins(longitude, latitude, price, cell_size=DEFAULT_CELL_SIZE):
+    """
+    Aggregate points into a square grid
+
+    Args:
+        longitude (array-like): Point longitudes
+        latitude (array-like): Point latitudes
+        price (array-like): Value whose median is reported per cell
+        cell_size (float): Cell edge in degrees of latitude
+
+    Returns:
+        pd.DataFrame: Cell centre, ``count`` and ``median_price`` per cell
+    """
+    lon, lat, price = _valid(longitude, latitude, price)
+    x, y, scale = _projected(lon, lat)
+    ix = np.floor(x / cell_size).astype(np.int64)
+    iy = np.floor(y / cell_size).astype(np.int64)
+    keys = (ix << 32) + (iy - iy.min() if len(iy) else iy)
+    unique, counts, medians = _cell_medians(keys, price)
+    cx = (unique >> 32) + 0.5
+    cy = (unique & 0xFFFFFFFF) + (iy.min() if len(iy) else 0) + 0.5
+    return _frame(cx * cell_size / scale, cy * cell_size, counts, medians)
+
+
+def hex_bins(longitude, latitude, price, cell_size=DEFAULT_CELL_SIZE):
+    """
+    Aggregate points into pointy-top hexagonal cells
+
+    The hexagonal lattice is the union of two offset rectangular lattices;
+    each point goes to the nearer of its two candidate centres.
+
+    Args:
+        longitude (array-like): Point longitudes
+        latitude (array-like): Point latitudes
+        price (array-like): Value whose median is reported per cell
+        cell_size (float): Distance between neighbouring centres, in degrees
+            of latitude
+
+    Returns:
+        pd.DataFrame: Cell centre, ``count`` and ``median_price`` per cell
+    """
+    lon, lat, price = _valid(longitude, latitude, price)
+    x, y, scale = _projected(lon, lat)
+    x = x / cell_size
+    y = y / (cell_size * SQRT3)
+
+    x1, y1 = np.round(x), np.round(y)
+    x2, y2 = np.floor(x) + 0.5, np.floor(y) + 0.5
+    first = (x - x1) ** 2 + 3 * (y - y1) ** 2 <= (x - x2) ** 2 + 3 * (y - y2) ** 2
+    # Doubled lattice coordinates are integers for both lattices.
+    dx = np.where(first, 2 * x1, 2 * x2).astype(np.int64)
+    dy = np.where(first, 2 * y1, 2 * y2).astype(np.int64)
+    dy_min = dy.min() if len(dy) else 0
+    keys = (dx << 32) + (dy - dy_min)
+
+    unique, counts, medians = _cell_medians(keys, price)
+    cx = (unique >> 32) / 2
+    cy = ((unique & 0xFFFFFFFF) + dy_min) / 2
+    return _frame(cx * cell_size / scale, cy * cell_size * SQRT3, counts, medians)
+
+
+def listing_bins(frame, shape="hex", cell_size=DEFAULT_CELL_SIZE):
+    """
+    Bin a listings frame on its ``longitude``/``latitude``/``price`` columns
+
+    Args:
+        frame (pd.DataFrame): Listings with coordinate and price columns
+        shape (str): ``"hex"`` or ``"square"``
+        cell_size (float): Cell size in degrees of latitude
+
+    Returns:
+        pd.DataFrame: One row per occupied cell
+    """
+    if shape not in BINNERS:
+        raise ValueError(f"Unknown bin shape {shape!r}; expected one of {sorted(BINNERS)}")
+    return BINNERS[shape](
+        frame["longitude"], frame["latitude"], frame["price"], cell_size=cell_size
+    )
+
+
+def map_mode(row_count, mode="auto", threshold=None):
+    """
+    Resolve the map mode for ``row_count`` listings
+
+    ``"auto"`` draws individual points up to ``threshold`` rows and hexagonal
+    bins above it; any other mode is returned unchanged.
+
+    Args:
+        row_count (int): Number of listings to draw
+        mode (str): ``"auto"``, ``"points"``, ``"hex"`` or ``"square"``
+        threshold (int, optional): Point limit, defaults to
+            ``AIRBNB_MAP_POINT_LIMIT`` or ``DEFAULT_POINT_THRESHOLD``
+
+    Returns:
+        str: ``"points"``, ``"hex"`` or ``"square"``
+    """
+    if mode != "auto":
+        return mode
+    if threshold is None:
+        threshold = int(os.getenv("AIRBNB_MAP_POINT_LIMIT", DEFAULT_POINT_THRESHOLD))
+    return "points" if row_count <= threshold else "hex"
+
+
+BINNERS = {"hex": hex_bins, "square": square_bins}
+
+
+def price_histogram(frame, maxbins=40, value="price", by="room_type"):
+    """
+    Count ``value`` in at most ``maxbins`` equal-width bins per ``by`` category
+
+    Args:
+        frame (pd.DataFrame): Listings with ``value`` and ``by`` columns
+        maxbins (int): Number of bins across the whole value range
+        value (str): Column to bin
+        by (str): Column whose categories are counted separately
+
+    Returns:
+        pd.DataFrame: ``bin_start``, ``bin_end``, ``by`` and ``count``, one row
+        per non-empty bin and category
+    """
+    values = pd.to_numeric(frame[value], errors="coerce").to_numpy("float64")
+    valid = np.isfinite(values)
+    values = values[valid]
+    categories = pd.Categorical(frame[by].to_numpy()[valid])
+    edges = np.histogram_bin_edges(values, bins=maxbins)
+    # Right edge inclusive, as np.histogram does.
+    bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, maxbins - 1)
+    counts = np.zeros((len(categories.categories), maxbins), dtype=np.int64)
+    valid_codes = categories.codes >= 0
+    np.add.at(counts, (categories.codes[valid_codes], bins[valid_codes]), 1)
+    category, bin_index = np.nonzero(counts)
+    return pd.DataFrame(
+        {
+            "bin_start": edges[bin_index],
+            "bin_end": edges[bin_index + 1],
+            by: categories.categories[category],
+            "count": counts[category, bin_index],
+        }
+    )
@@ -0,0 +1,268 @@
+"""
+Neighbourhood polygon layer for the Airbnb map.
+
+The GeoJSON is downloaded once, simplified with a topology-preserving coverage
+simplification (shared borders stay shared), snapped to a coordinate grid and
+optionally converted to TopoJSON. The result is cached on disk, so reruns and
+restarts read a small local file instead of the full-resolution polygons.
+"""
+
+import hashlib
+import json
+import os
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import requests
+
+from airbnb_data import data_dir
+
+# Degrees; ~20 m at San Francisco's latitude.
+DEFAULT_TOLERANCE = 0.0002
+# Decimal places kept in coordinates; 5 is ~1 m.
+DEFAULT_DECIMALS = 5
+TOPOJSON_OBJECT = "neighbourhoods"
+# Property holding the neighbourhood name in the SF GeoJSON.
+NAME_PROPERTY = "neighborho"
+# Property holding it in Inside Airbnb's own neighbourhoods.geojson.
+INSIDE_AIRBNB_NAME_PROPERTY = "neighbourhood"
+
+
+def _cache_path(url, tolerance, decimals, topojson, directory):
+    digest = hashlib.sha1(url.encode()).hexdigest()[:12]
+    suffix = "topo" if topojson else "geo"
+    name = f"neighbourhoods-{digest}-{tolerance:g}-{decimals}.{suffix}.json"
+    return data_dir(directory) / name
+
+
+def simplify_neighbourhoods(
+    geojson, tolerance=DEFAULT_TOLERANCE, decimals=DEFAULT_DECIMALS
+):
+    """
+    Simplify and quantize a neighbourhood FeatureCollection
+
+    Args:
+        geojson (dict): GeoJSON FeatureCollection
+        tolerance (float): Simplification tolerance in coordinate units
+        decimals (int): Decimal places coordinates are snapped to
+
+    Returns:
+        geopandas.GeoDataFrame: Simplified polygons with their properties
+    """
+    import geopandas as gpd
+    import shapely
+
+    gdf = gpd.GeoDataFrame.from_features(geojson["features"], crs="EPSG:4326")
+    geoms = shapely.make_valid(gdf.geometry.values)
+    if hasattr(shapely, "coverage_simplify") and shapely.coverage_is_valid(geoms):
+        # Simplifies shared borders once, so neighbours stay gap-free.
+        geoms = shapely.coverage_simplify(geoms, tolerance)
+    else:
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=True)
+    geoms = shapely.set_precision(geoms, 10**-decimals)
+    geoms = shapely.transform(geoms, lambda coords: np.round(coords, decimals))
+    return gdf.set_geometry(geoms)
+
+
+def _to_topojson(gdf):
+    try:
+        import topojson
+    except ImportError:
+        return None
+    topology = topojson.Topology(gdf, object_name=TOPOJSON_OBJECT, prequantize=False)
+    return topology.to_dict()
+
+
+def load_neighbourhoods(
+    url,
+    tolerance=DEFAULT_TOLERANCE,
+    decimals=DEFAULT_DECIMALS,
+    topojson=False,
+    directory=None,
+):
+    """
+    Return the simplified neighbourhood layer for ``url``, cached on disk
+
+    Args:
+        url (str): GeoJSON FeatureCollection URL
+        tolerance (float): Simplification tolerance in degrees
+        decimals (int): Decimal places coordinates are snapped to
+        topojson (bool): Convert to TopoJSON (needs the optional ``topojson``
+            package; falls back to GeoJSON without it)
+        directory (str | Path): Cache directory
+
+    Returns:
+        dict: ``{"format": "geojson" | "topojson", "data": ...}``
+    """
+    path = _cache_path(url, tolerance, decimals, topojson, directory)
+    if path.exists():
+        return json.loads(path.read_text())
+
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    gdf = simplify_neighbourhoods(response.json(), tolerance, decimals)
+
+    layer = None
+    if topojson:
+        topology = _to_topojson(gdf)
+        if topology is not None:
+            layer = {"format": "topojson", "data": topology}
+    if layer is None:
+        layer = {"format": "geojson", "data": json.loads(gdf.to_json(drop_id=True))}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(layer, separators=(",", ":")))
+    os.replace(tmp, path)
+    return layer
+
+
+def neighbourhoods_url(listings_url):
+    """Inside Airbnb's neighbourhood GeoJSON for the snapshot of ``listings_url``."""
+    return listings_url.replace(
+        "/data/listings.csv.gz", "/visualisations/neighbourhoods.geojson"
+    )
+
+
+def neighbourhood_data(layer):
+    """Wrap a layer from ``load_neighbourhoods`` as Altair data."""
+    if layer["format"] == "topojson":
+        return alt.Data(
+            values=layer["data"],
+            format=alt.DataFormat(type="topojson", feature=TOPOJSON_OBJECT),
+        )
+    return alt.Data(values=layer["data"]["features"])
+
+
+def _layer_features(layer):
+    """Return (properties, shapely geometries) for every polygon in ``layer``."""
+    import shapely
+    from shapely.geometry import shape
+
+    if layer["format"] == "topojson":
+        import geopandas as gpd
+
+        gdf = gpd.read_file(json.dumps(layer["data"]), layer=TOPOJSON_OBJECT)
+        properties = gdf.drop(columns="geometry").to_dict("records")
+        return properties, np.asarray(gdf.geometry.values, dtype=object)
+    features = layer["data"]["features"]
+    properties = [feature["properties"] for feature in features]
+    geoms = np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+    return properties, shapely.make_valid(geoms)
+
+
+def assign_polygons(longitude, latitude, geoms):
+    """
+    Find the polygon containing each point with one STRtree query
+
+    Args:
+        longitude (np.ndarray): Point longitudes
+        latitude (np.ndarray): Point latitudes
+        geoms (np.ndarray): Polygon geometries
+
+    Returns:
+        np.ndarray: int16 polygon position per point, -1 where none contains it
+    """
+    import shapely
+
+    points = shapely.points(
+        np.asarray(longitude, dtype="float64"), np.asarray(latitude, dtype="float64")
+    )
+    tree = shapely.STRtree(geoms)
+    point_idx, polygon_idx = tree.query(points, predicate="intersects")
+    # Points on a shared border match twice; keep the first polygon.
+    point_idx, first = np.unique(point_idx, return_index=True)
+    assigned = np.full(len(points), -1, dtype=np.int16)
+    assigned[point_idx] = polygon_idx[first]
+    return assigned
+
+
+def join_neighbourhoods(listings, layer, cache_key=None, directory=None):
+    """
+    Add ``polygon_id`` and ``polygon`` columns by point-in-polygon join
+
+    Args:
+        listings (pd.DataFrame): Listings with id/longitude/latitude columns
+        layer (dict): Layer from ``load_neighbourhoods``
+        cache_key (str): Name of the listings snapshot; when given, the
+            assignment is cached on disk next to it
+        directory (str | Path): Cache directory
+
+    Returns:
+        pd.DataFrame: ``listings`` with the two new columns
+    """
+    properties, geoms = _layer_features(layer)
+    names = [
+        str(p.get(NAME_PROPERTY, p.get(INSIDE_AIRBNB_NAME_PROPERTY, i)))
+        for i, p in enumerate(properties)
+    ]
+
+    path = None
+    if cache_key is not None:
+        layer_digest = hashlib.sha1(
+            json.dumps(layer, sort_keys=True).encode()
+        ).hexdigest()[:12]
+        path = data_dir(directory) / f"polygons-{cache_key}-{layer_digest}.parquet"
+
+    if path is not None and path.exists():
+        cached = pd.read_parquet(path).set_index("id")["polygon_id"]
+        polygon_id = cached.reindex(listings["id"]).fillna(-1).to_numpy("int16")
+    else:
+        polygon_id = assign_polygons(listings["longitude"], listings["latitude"], geoms)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame({"id": listings["id"], "polygon_id": polygon_id}).to_parquet(
+                path, index=False
+            )
+
+    joined = listings.assign(polygon_id=polygon_id)
+    joined["polygon"] = pd.Categorical.from_codes(polygon_id, categories=names)
+    return joined
+
+
+def neighbourhood_stats(listings):
+    """Listing count and median price per polygon, computed with one groupby."""
+    return (
+        listings[listings["polygon_id"] >= 0]
+        .groupby("polygon_id")["price"]
+        .agg(listings="size", median_price="median")
+        .reset_index()
+    )
+
+
+def with_stats(layer, stats):
+    """
+    Copy ``layer`` with ``listings``/``median_price`` added to each polygon's
+    properties, for a choropleth
+
+    Args:
+        layer (dict): Layer from ``load_neighbourhoods``
+        stats (pd.DataFrame): Rows from ``neighbourhood_stats``
+
+    Returns:
+        dict: New layer; ``layer`` itself is not modified
+    """
+    by_polygon = stats.set_index("polygon_id").to_dict("index")
+    if layer["format"] == "topojson":
+        data = dict(layer["data"])
+        objects = dict(data["objects"])
+        collection = dict(objects[TOPOJSON_OBJECT])
+        items = collection["geometries"]
+    else:
+        data = dict(layer["data"])
+        items = data["features"]
+
+    enriched = []
+    for i, item in enumerate(items):
+        values = by_polygon.get(i, {"listings": 0, "median_price": None})
+        properties = {**item.get("properties", {}), **values}
+        enriched.append({**item, "properties": properties})
+
+    if layer["format"] == "topojson":
+        collection["geometries"] = enriched
+        objects[TOPOJSON_OBJECT] = collection
+        data["objects"] = objects
+    else:
+        data["features"] = enriched
+    return {"format": layer["format"], "data": data}
@@ -0,0 +1,182 @@
+"""
+Incremental sidebar filtering for the Airbnb listings.
+
+``ListingFilter`` precomputes, once per listings frame, a row bitmap and a
+sorted position array per category value and a price-sorted index. A selection
+starts from the smallest candidate set (one category's rows, or a
+``searchsorted`` slice of the price index) and narrows it with the remaining
+bitmaps, so a widget change costs O(selected rows). Columns are taken for the
+selected rows only when a chart asks for them; the full frame is never copied.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ("neighbourhood", "room_type")
+VALUE_COLUMN = "price"
+
+
+def _category_index(values):
+    """
+    Map each category to its row bitmap and sorted row positions
+
+    Args:
+        values (pd.Series): Column to index
+
+    Returns:
+        dict: value -> (bool bitmap, int32 positions)
+    """
+    categorical = pd.Categorical(values)
+    codes = categorical.codes
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    bounds = np.searchsorted(codes[order], np.arange(len(categorical.categories) + 1))
+    index = {}
+    for i, category in enumerate(categorical.categories):
+        index[category] = (codes == i, order[bounds[i] : bounds[i + 1]])
+    return index
+
+
+class ListingSelection:
+    """
+    Rows of a listings frame chosen by ``ListingFilter.select``
+
+    Args:
+        frame (pd.DataFrame): Shared listings frame; never modified
+        positions (np.ndarray | None): Sorted row positions, or None for all
+    """
+
+    def __init__(self, frame, positions):
+        self.frame = frame
+        self.positions = positions
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.frame) if self.positions is None else len(self.positions)
+
+    def column(self, name):
+        """Return ``name`` for the selected rows, taken once and reused."""
+        if name not in self._columns:
+            values = self.frame[name]
+            if self.positions is not None:
+                values = values.take(self.positions).reset_index(drop=True)
+            self._columns[name] = values
+        return self._columns[name]
+
+    def columns(self, names):
+        """
+        Materialize only ``names`` for the selected rows
+
+        Args:
+            names (list): Column names a chart needs
+
+        Returns:
+            pd.DataFrame: New frame; the shared listings frame is not copied
+        """
+        return pd.DataFrame(
+            {name: self.column(name) for name in names if name in self.frame.columns},
+            copy=False,
+        )
+
+
+class ListingFilter:
+    """
+    Precomputed category bitmaps and price index over a listings frame
+
+    Args:
+        df (pd.DataFrame): Listings from ``load_listings``/``join_neighbourhoods``
+        categories (tuple): Columns filterable by a single value
+        value (str): Numeric column filterable by an inclusive range
+    """
+
+    def __init__(self, df, categories=CATEGORY_COLUMNS, value=VALUE_COLUMN):
+        self.frame = df.reset_index(drop=True)
+        self.categories = {
+            column: _category_index(self.frame[column])
+            for column in categories
+            if column in self.frame.columns
+        }
+        self.values = self.frame[value].to_numpy()
+        self.value_order = np.argsort(self.values, kind="stable").astype(np.int32)
+        self.sorted_values = self.values[self.value_order]
+        self._none = (
+            np.zeros(len(self.frame), dtype=bool),
+            np.empty(0, dtype=np.int32),
+        )
+
+    def __len__(self):
+        return len(self.frame)
+
+    def options(self, column):
+        """Sorted values of ``column`` that have at least one listing."""
+        index = self.categories.get(column, {})
+        return sorted(value for value, (_, rows) in index.items() if len(rows))
+
+    def value_range(self):
+        """Smallest and largest value of the range column."""
+        if not len(self.sorted_values):
+            return 0, 0
+        return self.sorted_values[0], self.sorted_values[-1]
+
+    def _value_slice(self, low, high):
+        lo = np.searchsorted(self.sorted_values, low, side="left")
+        hi = np.searchsorted(self.sorted_values, high, side="right")
+        return self.value_order[lo:hi]
+
+    def positions(self, value_range=None, **selected):
+        """
+        Return the sorted row positions matching the selection
+
+        Args:
+            value_range (tuple, optional): Inclusive ``(low, high)`` bounds;
+                None keeps every value
+            **selected: Category column -> value; None or ``"All"`` keeps all
+
+        Returns:
+            np.ndarray | None: int32 positions, or None when nothing is filtered
+        """
+        bitmaps, candidates = [], []
+        for column, value in selected.items():
+            if value is None or value == "All" or column not in self.categories:
+                continue
+            bitmap, rows = self.categories[column].get(value, self._none)
+            bitmaps.append(bitmap)
+            candidates.append(rows)
+
+        low, high = self.value_range()
+        if value_range is not None and (value_range[0] > low or value_range[1] < high):
+            low, high = value_range
+            candidates.append(self._value_slice(low, high))
+            in_range = True
+        else:
+            in_range = False
+        if not candidates:
+            return None
+
+        # Start from the smallest candidate set and narrow it with the rest.
+        smallest = min(range(len(candidates)), key=lambda i: len(candidates[i]))
+        rows = candidates[smallest]
+        keep = np.ones(len(rows), dtype=bool)
+        for i, bitmap in enumerate(bitmaps):
+            if i != smallest:
+                keep &= bitmap[rows]
+        if in_range and smallest != len(candidates) - 1:
+            values = self.values[rows]
+            keep &= (values >= low) & (values <= high)
+        rows = rows[keep]
+        if in_range and smallest == len(candidates) - 1:
+            # The price slice is in value order; restore row order.
+            rows = np.sort(rows)
+        return rows
+
+    def select(self, value_range=None, **selected):
+        """
+        Select rows without copying the listings frame
+
+        Args:
+            value_range (tuple, optional): Inclusive ``(low, high)`` bounds
+            **selected: Category column -> value; None or ``"All"`` keeps all
+
+        Returns:
+            ListingSelection: Lazily materialized selection
+        """
+        return ListingSelection(self.frame, self.positions(value_range, **selected))
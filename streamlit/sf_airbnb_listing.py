@@ -1,96 +1,186 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
 import altair as alt
-import requests
-import json
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.charts import enable_vegafusion, render_chart  # noqa: E402
+from common.perf import show_panel, span, start_rerun  # noqa: E402
+from airbnb_data import (  # noqa: E402
+    available_snapshots,
+    load_listings,
+    snapshot_key,
+    snapshot_parts,
+)
+from binning import listing_bins, map_mode, price_histogram  # noqa: E402
+from listing_filter import ListingFilter  # noqa: E402
+from geo import (  # noqa: E402
+    join_neighbourhoods,
+    load_neighbourhoods,
+    neighbourhood_data,
+    neighbourhood_stats,
+    neighbourhoods_url,
+    with_stats,
+)
+
+enable_vegafusion()
+start_rerun('sf_airbnb_listing')
 
 # --- DATA LOADING FROM URLS ---
-# Load GeoJSON from URL
-geojson_url = "https://gist.githubusercontent.com/cdolek/d08cac2fa3f6338d84ea/raw/ebe3d2a4eda405775a860d251974e1f08cbe4f48/SanFrancisco.Neighborhoods.json"
-geojson_data = requests.get(geojson_url).json()
-
-# Load Airbnb listings from URL
-listings_url = "https://data.insideairbnb.com/united-states/ca/san-francisco/2025-03-01/data/listings.csv.gz"
-df = pd.read_csv(listings_url, compression='gzip')
-
-# --- DATA CLEANING ---
-# Clean price column: remove $ and , then convert to float
-if df['price'].dtype != float:
-    df['price'] = (
-        df['price']
-        .astype(str)
-        .str.replace('$', '', regex=False)
-        .str.replace(',', '', regex=False)
-        .astype(float)
+# Default snapshot, ingested on first run; others via `python airbnb_data.py ingest URL`
+default_listings_url = "https://data.insideairbnb.com/united-states/ca/san-francisco/2025-03-01/data/listings.csv.gz"
+# Load GeoJSON from URL (simplified and cached on disk)
+sf_geojson_url = "https://gist.githubusercontent.com/cdolek/d08cac2fa3f6338d84ea/raw/ebe3d2a4eda405775a860d251974e1f08cbe4f48/SanFrancisco.Neighborhoods.json"
+
+# --- CITY & SNAPSHOT ---
+snapshots = available_snapshots()
+default_city, default_date = snapshot_parts(default_listings_url)
+snapshots.setdefault(default_city, {}).setdefault(default_date, default_listings_url)
+cities = sorted(snapshots)
+selected_city = st.sidebar.selectbox('City', cities, index=cities.index(default_city))
+dates = sorted(snapshots[selected_city], reverse=True)
+selected_date = st.sidebar.selectbox('Snapshot', dates)
+listings_url = snapshots[selected_city][selected_date]
+if selected_city == default_city:
+    geojson_url, name_property = sf_geojson_url, 'neighborho'
+else:
+    geojson_url, name_property = neighbourhoods_url(listings_url), 'neighbourhood'
+
+
+# Only the selected snapshot is kept in memory, however many are ingested
+@st.cache_resource(show_spinner="Loading neighbourhoods...", max_entries=2)
+def get_neighbourhoods(url):
+    return load_neighbourhoods(url)
+
+
+neighbourhood_layer = get_neighbourhoods(geojson_url)
+
+
+@st.cache_resource(show_spinner="Loading listings...", max_entries=1)
+def get_listing_filter(url, geojson_url):
+    # Reconcile each listing with the polygon that contains it (cached on disk)
+    listings = join_neighbourhoods(
+        load_listings(url), get_neighbourhoods(geojson_url), cache_key=snapshot_key(url)
     )
-# Basic cleaning: remove extreme outliers for price
-if 'price' in df.columns:
-    df = df[df['price'].between(10, 1000)]
+    return ListingFilter(listings)
+
+
+# Shared between sessions: select rows by position, never modify in place
+with span('load') as load_span:
+    listing_filter = get_listing_filter(listings_url, geojson_url)
+    load_span.record(rows=len(listing_filter))
 
 # --- SIDEBAR FILTERS ---
 st.sidebar.header('Filter Listings')
-neighbourhoods = ['All'] + sorted(df['neighbourhood'].dropna().unique()) if 'neighbourhood' in df.columns else ['All']
-room_types = ['All'] + sorted(df['room_type'].dropna().unique()) if 'room_type' in df.columns else ['All']
+neighbourhoods = ['All'] + listing_filter.options('neighbourhood')
+room_types = ['All'] + listing_filter.options('room_type')
 selected_neighbourhood = st.sidebar.selectbox('Neighbourhood', neighbourhoods)
 selected_room_type = st.sidebar.selectbox('Room Type', room_types)
-price_min, price_max = int(df['price'].min()), int(df['price'].max())
+price_min, price_max = (int(price) for price in listing_filter.value_range())
 selected_price = st.sidebar.slider('Price Range', price_min, price_max, (price_min, price_max))
+map_modes = {'Auto': 'auto', 'Points': 'points', 'Hexagons': 'hex', 'Squares': 'square'}
+selected_map_mode = map_modes[st.sidebar.selectbox('Map Marks', list(map_modes))]
 
 # --- FILTER DATA ---
-filtered = df.copy()
-if selected_neighbourhood != 'All' and 'neighbourhood' in filtered.columns:
-    filtered = filtered[filtered['neighbourhood'] == selected_neighbourhood]
-if selected_room_type != 'All' and 'room_type' in filtered.columns:
-    filtered = filtered[filtered['room_type'] == selected_room_type]
-filtered = filtered[filtered['price'].between(*selected_price)]
+# Bitmaps and a sorted price index; columns are taken per chart as needed
+with span('filter') as filter_span:
+    filtered = filter_span.record(listing_filter.select(
+        value_range=selected_price,
+        neighbourhood=selected_neighbourhood,
+        room_type=selected_room_type,
+    ))
 
 # --- MAIN DASHBOARD ---
-st.title('San Francisco Airbnb Listings Dashboard')
-st.markdown('''
-Explore Airbnb listings in San Francisco. Use the filters to interactively explore the data. Charts are coordinated for deeper insights.
+city_name = selected_city.replace('-', ' ').title()
+st.title(f'{city_name} Airbnb Listings Dashboard')
+st.markdown(f'''
+Explore Airbnb listings in {city_name} ({selected_date} snapshot). Use the filters to interactively explore the data. Charts are coordinated for deeper insights.
 ''')
 
 # --- 1. MAP OF LISTINGS ---
+# Median price per polygon, aggregated here rather than in the browser
+with span('aggregate:neighbourhoods') as stats_span:
+    stats = stats_span.record(neighbourhood_stats(filtered.columns(['polygon_id', 'price'])))
+    choropleth_layer = with_stats(neighbourhood_layer, stats)
 sf_chart = (
-    alt.Chart(alt.Data(values=geojson_data["features"]))
-    .mark_geoshape(fillOpacity=0.08, fill='lightgray', stroke='black')
+    alt.Chart(neighbourhood_data(choropleth_layer))
+    .mark_geoshape(fillOpacity=0.25, stroke='black')
     .encode(
+        color=alt.condition(
+            'isValid(datum.properties.median_price)',
+            alt.Color('properties.median_price:Q', scale=alt.Scale(scheme='redyellowgreen'), legend=None),
+            alt.value('lightgray')
+        ),
         tooltip=[
-            "properties.neighborho:N"
+            alt.Tooltip(f"properties.{name_property}:N", title="Neighbourhood"),
+            alt.Tooltip("properties.median_price:Q", title="Median Price ($)", format=",.0f"),
+            alt.Tooltip("properties.listings:Q", title="Listings")
         ]
     )
     .properties(width=800, height=350)
     .project("mercator")
 )
 
-map_chart = sf_chart + alt.Chart(filtered).mark_circle(size=50).encode(
-    longitude='longitude:Q',
-    latitude='latitude:Q',
-    color=alt.Color('price:Q', scale=alt.Scale(scheme='redyellowgreen'), legend=alt.Legend(title='Price ($)')),
-    tooltip=['name:N', 'neighbourhood:N', 'room_type:N', 'price:Q']
-).interactive()
+# Above the point threshold, bin listings into cells here so the browser
+# draws one mark per cell instead of one per listing
+mode = map_mode(len(filtered), selected_map_mode)
+if mode == 'points':
+    points = filtered.columns(['name', 'neighbourhood', 'room_type', 'longitude', 'latitude', 'price'])
+    listing_layer = alt.Chart(points).mark_circle(size=50).encode(
+        longitude='longitude:Q',
+        latitude='latitude:Q',
+        color=alt.Color('price:Q', scale=alt.Scale(scheme='redyellowgreen'), legend=alt.Legend(title='Price ($)')),
+        tooltip=['name:N', 'neighbourhood:N', 'room_type:N', 'price:Q']
+    )
+else:
+    hexagon = 'M0,-1L0.866,-0.5L0.866,0.5L0,1L-0.866,0.5L-0.866,-0.5Z'
+    with span('aggregate:bins') as bins_span:
+        bins = bins_span.record(listing_bins(filtered.columns(['longitude', 'latitude', 'price']), mode))
+    listing_layer = alt.Chart(bins).mark_point(
+        shape=hexagon if mode == 'hex' else 'square', filled=True, opacity=0.8
+    ).encode(
+        longitude='longitude:Q',
+        latitude='latitude:Q',
+        size=alt.Size('count:Q', legend=alt.Legend(title='Listings')),
+        color=alt.Color('median_price:Q', scale=alt.Scale(scheme='redyellowgreen'), legend=alt.Legend(title='Median Price ($)')),
+        tooltip=[
+            alt.Tooltip('count:Q', title='Listings'),
+            alt.Tooltip('median_price:Q', title='Median Price ($)', format=',.0f')
+        ]
+    )
+map_chart = (sf_chart + listing_layer).interactive()
 
 st.markdown('### Listing Locations by Price')
-st.altair_chart(map_chart, use_container_width=True)
+render_chart(map_chart, name='Listing Locations by Price', use_container_width=True)
 
 # --- 2. PRICE DISTRIBUTION & 3. REVIEWS VS. PRICE ---
 col1, col2 = st.columns(2, gap="large")
 
 with col1:
     st.markdown('### Price Distribution')
-    price_hist = alt.Chart(filtered).mark_bar().encode(
-        alt.X('price:Q', bin=alt.Bin(maxbins=40), title='Price ($)'),
-        y=alt.Y('count()', title='Count of Records'),
+    # Bin and count server-side so only the ~40 bars per room type are shipped
+    with span('aggregate:price_histogram') as hist_span:
+        binned = hist_span.record(
+            price_histogram(filtered.columns(['price', 'room_type']), maxbins=40)
+        )
+    price_hist = alt.Chart(binned).mark_bar().encode(
+        alt.X('bin_start:Q', bin='binned', title='Price ($)'),
+        x2='bin_end:Q',
+        y=alt.Y('count:Q', title='Count of Records'),
         color=alt.Color('room_type:N', legend=alt.Legend(title='Room Type')),
-        tooltip=['count()']
+        tooltip=[
+            alt.Tooltip('room_type:N', title='Room Type'),
+            alt.Tooltip('count:Q', title='Count of Records'),
+        ]
     ).properties(
         width=350, height=250
     )
-    st.altair_chart(price_hist, use_container_width=True)
+    render_chart(price_hist, name='Price Distribution', use_container_width=True)
 
 with col2:
     st.markdown('### Reviews vs. Price')
-    scatter = alt.Chart(filtered).mark_circle(size=60, opacity=0.6).encode(
+    scatter = alt.Chart(filtered.columns(['name', 'price', 'number_of_reviews', 'room_type'])).mark_circle(size=60, opacity=0.6).encode(
         x=alt.X('price:Q', title='Price ($)'),
         y=alt.Y('number_of_reviews:Q', title='Number of Reviews'),
         color=alt.Color('room_type:N', legend=alt.Legend(title='Room Type')),
@@ -98,7 +188,7 @@ with col2:
     ).properties(
         width=350, height=250
     ).interactive()
-    st.altair_chart(scatter, use_container_width=True)
+    render_chart(scatter, name='Reviews vs. Price', use_container_width=True)
 
 # --- DISCUSSION PROMPTS ---
 st.header('Discussion')
@@ -123,3 +213,5 @@ with st.expander('Challenges & Solutions: What challenges did you encounter duri
 - **Performance**: Used Streamlit caching to speed up data loading.
 - **Coordination**: Ensured all charts respond to filter changes for a seamless experience.
 ''')
+
+show_panel()
@@ -0,0 +1,211 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "csci3311" / "scorecard"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_SOFT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a query has never been cached."""
+
+
+def cache_key(endpoint, params):
+    """
+    Build a content address for an API query
+
+    The key ignores ``api_key`` and parameter order, and treats ``fields`` as a
+    set, so equivalent (endpoint, fields, filters, page) tuples share an entry.
+
+    Args:
+        endpoint (str): API endpoint
+        params (dict): Query parameters
+
+    Returns:
+        str: Hex digest identifying the query
+    """
+    normalized = {}
+    for name, value in (params or {}).items():
+        if name == "api_key":
+            continue
+        if name == "fields":
+            fields = value.split(",") if isinstance(value, str) else value
+            value = sorted(fields)
+        else:
+            value = str(value)
+        normalized[name] = value
+    payload = json.dumps([endpoint, normalized], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded cache of JSON API responses
+
+    Entries are gzip-compressed JSON files named by ``cache_key`` and written
+    atomically, so several processes (e.g. Streamlit workers) can share one
+    directory. An entry's mtime records its last use and drives LRU eviction;
+    the time it was fetched or last revalidated is stored inside the entry,
+    with the response's ``ETag``/``Last-Modified``, and drives the TTLs.
+
+    Entries older than ``soft_ttl`` are still served but should be revalidated
+    (see ``is_stale``); entries older than ``ttl`` are not served at all.
+
+    Args:
+        directory (str | Path): Cache directory; defaults to
+            ``$SCORECARD_CACHE_DIR`` or ``~/.cache/csci3311/scorecard``
+        ttl (float): Hard TTL: seconds before an entry is no longer served
+        soft_ttl (float): Seconds before an entry should be revalidated
+        max_bytes (int): Total on-disk size kept before evicting old entries
+        offline (bool): Serve only from the cache, ignoring the TTL; defaults
+            to ``$SCORECARD_OFFLINE``
+    """
+
+    def __init__(
+        self,
+        directory=None,
+        ttl=DEFAULT_TTL,
+        max_bytes=DEFAULT_MAX_BYTES,
+        offline=None,
+        soft_ttl=DEFAULT_SOFT_TTL,
+    ):
+        self.directory = Path(
+            directory or os.getenv("SCORECARD_CACHE_DIR") or DEFAULT_CACHE_DIR
+        )
+        self.ttl = ttl
+        self.soft_ttl = min(soft_ttl, ttl)
+        self.max_bytes = max_bytes
+        if offline is None:
+            offline = os.getenv("SCORECARD_OFFLINE", "").lower() in ("1", "true")
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def lookup(self, key):
+        """
+        Return the entry for ``key`` regardless of its age, or None when missing
+
+        Args:
+            key (str): Value from ``cache_key``
+
+        Returns:
+            dict | None: ``data``, ``stored_at`` and the ``etag`` and
+            ``last_modified`` validators (None when the server sent none)
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        entry.setdefault("etag", None)
+        entry.setdefault("last_modified", None)
+        return entry
+
+    def servable(self, entry):
+        """True if ``entry`` may be returned: offline, or within the hard TTL."""
+        return self.offline or time.time() - entry["stored_at"] <= self.ttl
+
+    def is_stale(self, entry):
+        """True if ``entry`` is past the soft TTL and should be revalidated."""
+        return not self.offline and time.time() - entry["stored_at"] > self.soft_ttl
+
+    def get(self, key):
+        """
+        Return the cached response for ``key``, or None when missing or expired
+
+        Args:
+            key (str): Value from ``cache_key``
+
+        Returns:
+            dict | list | None: Cached JSON response
+        """
+        entry = self.lookup(key)
+        if entry is None or not self.servable(entry):
+            return None
+        return entry["data"]
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """
+        Store ``data`` under ``key`` and evict old entries if over budget
+
+        Storing again after a ``304 Not Modified`` resets the entry's age.
+
+        Args:
+            key (str): Value from ``cache_key``
+            data (dict | list): JSON-serialisable response
+            etag (str): Response ``ETag``, sent back as ``If-None-Match``
+            last_modified (str): Response ``Last-Modified``, sent back as
+                ``If-Modified-Since``
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.open(raw, "wt", encoding="utf-8") as f:
+                    json.dump(
+                        {
+                            "stored_at": time.time(),
+                            "etag": etag,
+                            "last_modified": last_modified,
+                            "data": data,
+                        },
+                        f,
+                    )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += path.stat().st_size
+            if self._size > self.max_bytes:
+                self._size = self._evict()
+
+    def clear(self):
+        """Remove every cached entry."""
+        for path in self.directory.glob("*/*.json.gz"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._size = 0
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries until under ``max_bytes``."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        return total
@@ -1,16 +1,34 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-from data import fetch_college_data, prepare_cost_data, prepare_enrollment_data
+from data import (
+    cost_summary,
+    enrollment_summary,
+    national_index,
+    prepare_cache_stats,
+    prepare_cost,
+)
+from prefetch import session_prefetcher
+from snapshot import YEARS
 from visuals import cost_bar_chart, demographic_stacked_chart, enrollment_bar_chart
 
 import streamlit as st
 import numpy as np
 import altair as alt
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from common.charts import enable_vegafusion, render_chart  # noqa: E402
+from common.perf import fragment_run, show_panel, span, start_rerun  # noqa: E402
+
+enable_vegafusion()
+
 st.set_page_config(
     page_title="The College Affordability Crisis",
     layout="centered",
     initial_sidebar_state="collapsed",
 )
+start_rerun("college_affordability")
 
 # NYT-style centered container with floating TOC
 st.markdown(
@@ -157,10 +175,7 @@ with st.container():
         unsafe_allow_html=True,
     )
 
-# --- UI Controls ---
-
 # --- Section 1: Cost Visualizations ---
-figure_counter = 1
 st.markdown(
     '''
     <div class="nyt-center nyt-section" id="section1">
@@ -180,90 +195,118 @@ st.markdown(
     ''',
     unsafe_allow_html=True,
 )
-years = [f"{y}" for y in range(2017, 2023)]
-year = st.selectbox("Select Year", years, index=len(years) - 1)
-control_map = {
-    "All": None,
-    "Public": "1",
-    "Private Nonprofit": "2",
-    "Private For-Profit": "3",
-}
-control = st.selectbox("Institution Type", list(control_map.keys()))
-states = [
-    "All",
-    "CA",
-    "TX",
-    "FL",
-    "NY",
-    "PA",
-    "IL",
-    "OH",
-    "GA",
-    "NC",
-    "MI",
-    "MA",
-]
-state = st.selectbox("State", states)
-
-# --- Data Fetching ---
-data = fetch_college_data(
-    year, control=control_map[control], state=None if state == "All" else state
-)
-df = pd.DataFrame(data)
-if not df.empty:
-    st.subheader("Average College Costs by Institution Type")
-    cost_data, cost_melted, avg_cost = prepare_cost_data(df, year)
-    st.altair_chart(cost_bar_chart(avg_cost, year), use_container_width=True)
-    st.caption(f"Figure {figure_counter}: Average college costs by institution type (mock data).")
-    figure_counter += 1
-    st.subheader("Top 10 Most Expensive Institutions (Total Cost)")
-    st.write(f"Year: {year}, Institution Type: {control}, State: {state}")
-    st.dataframe(
-        cost_data.sort_values("Total Cost", ascending=False).head(10)[
-            ["Institution", "State", "Type", "Total Cost"]
-        ]
-    )
-    st.caption(f"Figure {figure_counter}: Top 10 most expensive institutions by total cost (mock data).")
-    figure_counter += 1
-else:
-    st.info("No data available for the selected filters.")
-st.markdown("</div>", unsafe_allow_html=True)
+@st.fragment
+@fragment_run("college_affordability:scorecard")
+def scorecard_sections(first_figure):
+    """Sections 1 and 2, which share the year, type and state filters."""
+    figure = first_figure
+    years = YEARS
+    year = st.selectbox("Select Year", years, index=len(years) - 1)
+    control_map = {
+        "All": None,
+        "Public": "1",
+        "Private Nonprofit": "2",
+        "Private For-Profit": "3",
+    }
+    control = st.selectbox("Institution Type", list(control_map.keys()))
+    states = [
+        "All",
+        "CA",
+        "TX",
+        "FL",
+        "NY",
+        "PA",
+        "IL",
+        "OH",
+        "GA",
+        "NC",
+        "MI",
+        "MA",
+    ]
+    state = st.selectbox("State", states)
 
-# --- Section 2: Enrollment Visualizations ---
-st.markdown(
-    '''
-    <div class="nyt-center nyt-section" id="section2">
-        <h2 style="font-size:1.5em; font-weight:600; margin-bottom:0.5em;">2. Who's Deciding Not to Go? Changing Enrollment Patterns</h2>
-        <div class="nyt-blockquote">
-            "Enrollment in higher education is no longer a given. Rising costs and shifting demographics are changing who goes to college—and who doesn't."
+    # --- Data Fetching ---
+    selected_states = None if state == "All" else state
+    with span("fetch") as fetch_span:
+        df = fetch_span.record(
+            national_index(year).select(
+                states=selected_states, ownership=control_map[control]
+            )
+        )
+    if not df.empty:
+        with span("prepare:cost") as prepare_span:
+            cost_data = prepare_span.record(
+                prepare_cost(df, year, control=control_map[control], state=state)
+            )
+            if prepare_span.active:
+                memo = prepare_cache_stats()
+                prepare_span.record(memo_hits=memo["hits"], memo_misses=memo["misses"])
+        with span("summary:cost") as summary_span:
+            avg_cost = summary_span.record(
+                cost_summary(year, states=selected_states, ownership=control_map[control])
+            )
+        st.subheader("Average College Costs by Institution Type")
+        render_chart(cost_bar_chart(avg_cost, year), use_container_width=True)
+        st.caption(f"Figure {figure}: Average college costs by institution type (mock data).")
+        figure += 1
+        st.subheader("Top 10 Most Expensive Institutions (Total Cost)")
+        st.write(f"Year: {year}, Institution Type: {control}, State: {state}")
+        st.dataframe(
+            cost_data.sort_values("Total Cost", ascending=False).head(10)[
+                ["Institution", "State", "Type", "Total Cost"]
+            ]
+        )
+        st.caption(f"Figure {figure}: Top 10 most expensive institutions by total cost (mock data).")
+        figure += 1
+    else:
+        st.info("No data available for the selected filters.")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # --- Section 2: Enrollment Visualizations ---
+    st.markdown(
+        '''
+        <div class="nyt-center nyt-section" id="section2">
+            <h2 style="font-size:1.5em; font-weight:600; margin-bottom:0.5em;">2. Who's Deciding Not to Go? Changing Enrollment Patterns</h2>
+            <div class="nyt-blockquote">
+                "Enrollment in higher education is no longer a given. Rising costs and shifting demographics are changing who goes to college—and who doesn't."
+            </div>
+            <p style="font-size:1.1em;">
+                Enrollment in U.S. colleges has declined for several years, with the sharpest drops among low-income and minority students. The reasons are complex: affordability, changing job markets, and shifting cultural values all play a role.
+            </p>
+            <ul class="nyt-bullets">
+                <li>Declining enrollment numbers</li>
+                <li>Demographic differences (race, income, region)</li>
+                <li>Who's most affected by rising costs?</li>
+            </ul>
         </div>
-        <p style="font-size:1.1em;">
-            Enrollment in U.S. colleges has declined for several years, with the sharpest drops among low-income and minority students. The reasons are complex: affordability, changing job markets, and shifting cultural values all play a role.
-        </p>
-        <ul class="nyt-bullets">
-            <li>Declining enrollment numbers</li>
-            <li>Demographic differences (race, income, region)</li>
-            <li>Who's most affected by rising costs?</li>
-        </ul>
-    </div>
-    ''',
-    unsafe_allow_html=True,
-)
-st.header("Section 2: Enrollment Patterns Explorer")
-if not df.empty:
-    enroll_data, enroll_by_type, demo_melted = prepare_enrollment_data(df, year)
-    st.altair_chart(
-        enrollment_bar_chart(enroll_by_type, year), use_container_width=True
-    )
-    st.caption(f"Figure {figure_counter}: Total enrollment by institution type (mock data).")
-    figure_counter += 1
-    st.altair_chart(
-        demographic_stacked_chart(demo_melted, year), use_container_width=True
+        ''',
+        unsafe_allow_html=True,
     )
-    st.caption(f"Figure {figure_counter}: Demographic breakdown of enrollment by institution type (mock data).")
-    figure_counter += 1
-else:
-    st.info("No enrollment data available for the selected filters.")
+    st.header("Section 2: Enrollment Patterns Explorer")
+    if not df.empty:
+        with span("prepare:enrollment") as prepare_span:
+            enroll_by_type, demo_by_type = enrollment_summary(
+                year, states=selected_states, ownership=control_map[control]
+            )
+            prepare_span.record(demo_by_type)
+        render_chart(
+            enrollment_bar_chart(enroll_by_type, year), use_container_width=True
+        )
+        st.caption(f"Figure {figure}: Total enrollment by institution type (mock data).")
+        figure += 1
+        render_chart(
+            demographic_stacked_chart(demo_by_type, year), use_container_width=True
+        )
+        st.caption(f"Figure {figure}: Demographic breakdown of enrollment by institution type (mock data).")
+        figure += 1
+    else:
+        st.info("No enrollment data available for the selected filters.")
+
+    # Warm the other states and the adjacent years in the background
+    session_prefetcher().schedule(year, control_map[control], states)
+
+
+scorecard_sections(first_figure=1)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 3: The Debt Question ---
@@ -287,30 +330,39 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-debt_states = ["All", "CA", "TX", "NY", "FL", "IL"]
-selected_debt_state = st.selectbox("Select State for Debt Data", debt_states, key="debt_state")
-debt_data = pd.DataFrame({
-    "Type": ["Public", "Private Nonprofit", "Private For-Profit"],
-    "Avg Debt": [28000, 34000, 39000]
-})
-st.bar_chart(debt_data.set_index("Type"))
-st.caption(f"Figure {figure_counter}: Average student debt by institution type (mock data).")
-figure_counter += 1
-
-default_data = pd.DataFrame({
-    "Status": ["Defaulted", "Not Defaulted"],
-    "Percent": [12, 88]
-})
-st.altair_chart(
-    alt.Chart(default_data).mark_arc().encode(
-        theta="Percent",
-        color="Status",
-        tooltip=["Status", "Percent"]
-    ).properties(title="Loan Default Rate (Mock Data)")
-)
-st.caption(f"Figure {figure_counter}: Proportion of borrowers who default on their student loans (mock data).")
-figure_counter += 1
-st.info("\"I graduated with $32,000 in debt. My payments are more than my rent.\" – Recent Grad, TX")
+
+@st.fragment
+@fragment_run("college_affordability:debt")
+def debt_section(first_figure):
+    """Section 3: debt by state and default rate."""
+    figure = first_figure
+    debt_states = ["All", "CA", "TX", "NY", "FL", "IL"]
+    st.selectbox("Select State for Debt Data", debt_states, key="debt_state")
+    debt_data = pd.DataFrame({
+        "Type": ["Public", "Private Nonprofit", "Private For-Profit"],
+        "Avg Debt": [28000, 34000, 39000]
+    })
+    st.bar_chart(debt_data.set_index("Type"))
+    st.caption(f"Figure {figure}: Average student debt by institution type (mock data).")
+    figure += 1
+
+    default_data = pd.DataFrame({
+        "Status": ["Defaulted", "Not Defaulted"],
+        "Percent": [12, 88]
+    })
+    render_chart(
+        alt.Chart(default_data).mark_arc().encode(
+            theta="Percent",
+            color="Status",
+            tooltip=["Status", "Percent"]
+        ).properties(title="Loan Default Rate (Mock Data)")
+    )
+    st.caption(f"Figure {figure}: Proportion of borrowers who default on their student loans (mock data).")
+    figure += 1
+    st.info("\"I graduated with $32,000 in debt. My payments are more than my rent.\" – Recent Grad, TX")
+
+
+debt_section(first_figure=5)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 4: Alternatives on the Rise ---
@@ -334,26 +386,35 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-alt_types = st.multiselect("Show alternatives:", ["Vocational", "Apprenticeship", "Military", "Gap Year"], default=["Vocational", "Apprenticeship"])
-years_alt = list(range(2015, 2023))
-alt_data = pd.DataFrame({
-    "Year": years_alt,
-    "Vocational": np.linspace(100000, 180000, len(years_alt)),
-    "Apprenticeship": np.linspace(50000, 90000, len(years_alt)),
-    "Military": np.linspace(30000, 35000, len(years_alt)),
-    "Gap Year": np.linspace(10000, 25000, len(years_alt)),
-})
-alt_data_melted = alt_data.melt("Year", var_name="Type", value_name="Enrollment")
-alt_data_melted = alt_data_melted[alt_data_melted["Type"].isin(alt_types)]
-st.altair_chart(
-    alt.Chart(alt_data_melted).mark_area(opacity=0.7).encode(
-        x="Year:O", y="Enrollment:Q", color="Type:N", tooltip=["Year", "Type", "Enrollment"]
-    ).properties(title="Alternative Pathways Enrollment (Mock Data)", width=600, height=350),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: Enrollment in alternative pathways such as vocational programs and apprenticeships (mock data).")
-figure_counter += 1
-st.success("Community college enrollment is up 15% since 2018 (mock stat).")
+
+@st.fragment
+@fragment_run("college_affordability:alternatives")
+def alternatives_section(first_figure):
+    """Section 4: enrollment in alternative pathways."""
+    figure = first_figure
+    alt_types = st.multiselect("Show alternatives:", ["Vocational", "Apprenticeship", "Military", "Gap Year"], default=["Vocational", "Apprenticeship"])
+    years_alt = list(range(2015, 2023))
+    alt_data = pd.DataFrame({
+        "Year": years_alt,
+        "Vocational": np.linspace(100000, 180000, len(years_alt)),
+        "Apprenticeship": np.linspace(50000, 90000, len(years_alt)),
+        "Military": np.linspace(30000, 35000, len(years_alt)),
+        "Gap Year": np.linspace(10000, 25000, len(years_alt)),
+    })
+    alt_data_melted = alt_data.melt("Year", var_name="Type", value_name="Enrollment")
+    alt_data_melted = alt_data_melted[alt_data_melted["Type"].isin(alt_types)]
+    render_chart(
+        alt.Chart(alt_data_melted).mark_area(opacity=0.7).encode(
+            x="Year:O", y="Enrollment:Q", color="Type:N", tooltip=["Year", "Type", "Enrollment"]
+        ).properties(title="Alternative Pathways Enrollment (Mock Data)", width=600, height=350),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: Enrollment in alternative pathways such as vocational programs and apprenticeships (mock data).")
+    figure += 1
+    st.success("Community college enrollment is up 15% since 2018 (mock stat).")
+
+
+alternatives_section(first_figure=7)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 5: Is It Still Worth It? ---
@@ -377,33 +438,42 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-majors = ["Engineering", "Business", "Education", "Arts", "Health"]
-selected_major = st.selectbox("Select Major", majors, key="roi_major")
-roi_data = pd.DataFrame({
-    "Major": majors,
-    "Median Earnings": [80000, 60000, 45000, 35000, 70000],
-    "Median Debt": [25000, 22000, 18000, 16000, 20000]
-})
-st.altair_chart(
-    alt.Chart(roi_data).transform_filter(
-        alt.FieldEqualPredicate(field="Major", equal=selected_major)
-    ).mark_bar().encode(
-        x="Major:N", y="Median Earnings:Q", color=alt.value("steelblue"), tooltip=["Major", "Median Earnings"]
-    ).properties(title="Median Earnings by Major", width=400),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: Median earnings for selected major (mock data).")
-figure_counter += 1
-st.altair_chart(
-    alt.Chart(roi_data).transform_filter(
-        alt.FieldEqualPredicate(field="Major", equal=selected_major)
-    ).mark_bar(color="orange").encode(
-        x="Major:N", y="Median Debt:Q", tooltip=["Major", "Median Debt"]
-    ).properties(title="Median Debt by Major", width=400),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: Median student debt for selected major (mock data).")
-figure_counter += 1
+
+@st.fragment
+@fragment_run("college_affordability:roi")
+def roi_section(first_figure):
+    """Section 5: earnings and debt by major."""
+    figure = first_figure
+    majors = ["Engineering", "Business", "Education", "Arts", "Health"]
+    selected_major = st.selectbox("Select Major", majors, key="roi_major")
+    roi_data = pd.DataFrame({
+        "Major": majors,
+        "Median Earnings": [80000, 60000, 45000, 35000, 70000],
+        "Median Debt": [25000, 22000, 18000, 16000, 20000]
+    })
+    render_chart(
+        alt.Chart(roi_data).transform_filter(
+            alt.FieldEqualPredicate(field="Major", equal=selected_major)
+        ).mark_bar().encode(
+            x="Major:N", y="Median Earnings:Q", color=alt.value("steelblue"), tooltip=["Major", "Median Earnings"]
+        ).properties(title="Median Earnings by Major", width=400),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: Median earnings for selected major (mock data).")
+    figure += 1
+    render_chart(
+        alt.Chart(roi_data).transform_filter(
+            alt.FieldEqualPredicate(field="Major", equal=selected_major)
+        ).mark_bar(color="orange").encode(
+            x="Major:N", y="Median Debt:Q", tooltip=["Major", "Median Debt"]
+        ).properties(title="Median Debt by Major", width=400),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: Median student debt for selected major (mock data).")
+    figure += 1
+
+
+roi_section(first_figure=8)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 6: Equity and Access ---
@@ -427,21 +497,30 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-groups = ["White", "Black", "Hispanic", "Asian", "First-Gen", "Low-Income"]
-selected_group = st.radio("Select Group", groups, key="equity_group")
-equity_data = pd.DataFrame({
-    "Group": groups,
-    "Attendance Rate": [0.65, 0.45, 0.40, 0.70, 0.35, 0.38]
-})
-st.altair_chart(
-    alt.Chart(equity_data).mark_bar().encode(
-        x="Group:N", y="Attendance Rate:Q", color="Group:N", tooltip=["Group", alt.Tooltip("Attendance Rate", format=".0%")]
-    ).properties(title="College Attendance Rate by Group (Mock Data)", width=600),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: College attendance rates by demographic group (mock data).")
-figure_counter += 1
-st.warning("First-gen students are 30% less likely to graduate (mock stat).")
+
+@st.fragment
+@fragment_run("college_affordability:equity")
+def equity_section(first_figure):
+    """Section 6: attendance rate by group."""
+    figure = first_figure
+    groups = ["White", "Black", "Hispanic", "Asian", "First-Gen", "Low-Income"]
+    st.radio("Select Group", groups, key="equity_group")
+    equity_data = pd.DataFrame({
+        "Group": groups,
+        "Attendance Rate": [0.65, 0.45, 0.40, 0.70, 0.35, 0.38]
+    })
+    render_chart(
+        alt.Chart(equity_data).mark_bar().encode(
+            x="Group:N", y="Attendance Rate:Q", color="Group:N", tooltip=["Group", alt.Tooltip("Attendance Rate", format=".0%")]
+        ).properties(title="College Attendance Rate by Group (Mock Data)", width=600),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: College attendance rates by demographic group (mock data).")
+    figure += 1
+    st.warning("First-gen students are 30% less likely to graduate (mock stat).")
+
+
+equity_section(first_figure=10)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 7: The Cultural Shift ---
@@ -465,21 +544,30 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-importance = st.slider("How important is a college degree for success?", 0, 100, 60)
-st.progress(importance)
-cultural_data = pd.DataFrame({
-    "Value": ["Skills", "Degree", "Experience", "Network", "Entrepreneurship"],
-    "Percent": [35, 25, 20, 10, 10]
-})
-st.altair_chart(
-    alt.Chart(cultural_data).mark_bar().encode(
-        x="Value:N", y="Percent:Q", color="Value:N", tooltip=["Value", "Percent"]
-    ).properties(title="What Americans Value for Success (Mock Poll)", width=600),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: What Americans say matters most for success in 2025 (mock poll).")
-figure_counter += 1
-st.info("In 2025, only 25% of young adults say a degree is 'very important' for success (mock poll).")
+
+@st.fragment
+@fragment_run("college_affordability:cultural")
+def cultural_section(first_figure):
+    """Section 7: what Americans value for success."""
+    figure = first_figure
+    importance = st.slider("How important is a college degree for success?", 0, 100, 60)
+    st.progress(importance)
+    cultural_data = pd.DataFrame({
+        "Value": ["Skills", "Degree", "Experience", "Network", "Entrepreneurship"],
+        "Percent": [35, 25, 20, 10, 10]
+    })
+    render_chart(
+        alt.Chart(cultural_data).mark_bar().encode(
+            x="Value:N", y="Percent:Q", color="Value:N", tooltip=["Value", "Percent"]
+        ).properties(title="What Americans Value for Success (Mock Poll)", width=600),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: What Americans say matters most for success in 2025 (mock poll).")
+    figure += 1
+    st.info("In 2025, only 25% of young adults say a degree is 'very important' for success (mock poll).")
+
+
+cultural_section(first_figure=11)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 8: Policy and the Future ---
@@ -503,22 +591,31 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-policies = ["Loan Forgiveness", "Free College", "Income-Driven Repayment", "Online Degrees"]
-selected_policies = st.multiselect("Show Policy Support:", policies, default=policies, key="policy_multiselect")
-policy_data = pd.DataFrame({
-    "Policy": policies,
-    "Support": [0.60, 0.48, 0.55, 0.35]
-})
-policy_data = policy_data[policy_data["Policy"].isin(selected_policies)]
-st.altair_chart(
-    alt.Chart(policy_data).mark_bar().encode(
-        x="Policy:N", y=alt.Y("Support:Q", axis=alt.Axis(format='%')), color="Policy:N", tooltip=["Policy", alt.Tooltip("Support", format='.0%')]
-    ).properties(title="Public Support for Policy Proposals (Mock Data)", width=600),
-    use_container_width=True
-)
-st.caption(f"Figure {figure_counter}: Public support for major college affordability policy proposals (mock data).")
-figure_counter += 1
-st.success("60% of Americans support some form of student debt relief (mock poll).")
+
+@st.fragment
+@fragment_run("college_affordability:policy")
+def policy_section(first_figure):
+    """Section 8: support for policy proposals."""
+    figure = first_figure
+    policies = ["Loan Forgiveness", "Free College", "Income-Driven Repayment", "Online Degrees"]
+    selected_policies = st.multiselect("Show Policy Support:", policies, default=policies, key="policy_multiselect")
+    policy_data = pd.DataFrame({
+        "Policy": policies,
+        "Support": [0.60, 0.48, 0.55, 0.35]
+    })
+    policy_data = policy_data[policy_data["Policy"].isin(selected_policies)]
+    render_chart(
+        alt.Chart(policy_data).mark_bar().encode(
+            x="Policy:N", y=alt.Y("Support:Q", axis=alt.Axis(format='%')), color="Policy:N", tooltip=["Policy", alt.Tooltip("Support", format='.0%')]
+        ).properties(title="Public Support for Policy Proposals (Mock Data)", width=600),
+        use_container_width=True
+    )
+    st.caption(f"Figure {figure}: Public support for major college affordability policy proposals (mock data).")
+    figure += 1
+    st.success("60% of Americans support some form of student debt relief (mock poll).")
+
+
+policy_section(first_figure=12)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # --- Section 9: Data Deep-Dive ---
@@ -542,6 +639,8 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# Figures 1-12 are numbered by the sections above
+figure_counter = 13
 tab1, tab2, tab3 = st.tabs(["Tuition", "Enrollment", "Debt"])
 with tab1:
     st.write("Explore tuition data (mock).")
@@ -606,3 +705,5 @@ st.markdown(
 """,
     unsafe_allow_html=True,
 )
+
+show_panel()
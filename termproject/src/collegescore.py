@@ -1,16 +1,168 @@
+import logging
+import math
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from cache import CacheMiss, ResponseCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+# The Scorecard API rejects per_page values above 100.
+MAX_PER_PAGE = 100
+# api.data.gov keys default to 1,000 requests per rolling hour.
+DEFAULT_HOURLY_LIMIT = 1000
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Stale cache entries refreshed at once in the background.
+REVALIDATE_WORKERS = 2
+
+# Year-scoped metrics, requested as f"{year}.{metric}".
+YEAR_METRICS = [
+    "cost.tuition.in_state",
+    "cost.tuition.out_of_state",
+    "cost.attendance.academic_year",
+    "cost.avg_net_price.public",
+    "cost.avg_net_price.private",
+    "student.size",
+    "student.demographics.race_ethnicity.white",
+    "student.demographics.race_ethnicity.black",
+    "student.demographics.race_ethnicity.hispanic",
+    "student.demographics.race_ethnicity.asian",
+    "student.demographics.race_ethnicity.aian",
+    "student.demographics.race_ethnicity.nhpi",
+    "student.demographics.race_ethnicity.two_or_more",
+    "student.demographics.race_ethnicity.non_resident_alien",
+    "student.demographics.race_ethnicity.unknown",
+    "student.demographics.first_generation",
+]
+SCHOOL_FIELDS = [
+    "id",
+    "school.name",
+    "school.state",
+    "school.control",
+    "school.region_id",
+    "school.ownership",
+]
+
+
+def scorecard_fields(year):
+    """Return the dotted field names requested for ``year``."""
+    return [f"{year}.{metric}" for metric in YEAR_METRICS] + SCHOOL_FIELDS
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread of a client
+
+    The bucket refills at ``limit`` tokens per hour and is re-synchronised with
+    the ``X-RateLimit-Limit`` / ``X-RateLimit-Remaining`` headers after every
+    response, so bulk pulls slow down before the key's quota runs out.
+
+    Args:
+        limit (int): Requests allowed per hour
+    """
+
+    def __init__(self, limit=DEFAULT_HOURLY_LIMIT):
+        self.capacity = float(limit)
+        self.tokens = float(limit)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.capacity / 3600
+
+    def _refill(self):
+        now = time.monotonic()
+        refill = (now - self._updated) * self.rate
+        self.tokens = min(self.capacity, self.tokens + refill)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent, then consume one token."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def available(self):
+        """Return the tokens currently in the bucket without consuming any."""
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def update(self, headers):
+        """Align the bucket with the rate-limit headers of a response."""
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        with self._lock:
+            self._refill()
+            if limit and limit.isdigit():
+                self.capacity = float(limit)
+            if remaining and remaining.isdigit():
+                self.tokens = min(self.tokens, float(remaining))
 
 
 class CollegeScorecardClient:
-    def __init__(self, api_key=None):
-        self.base_url = "https://api.data.gov/ed/collegescorecard/v1/"
+    def __init__(
+        self,
+        api_key=None,
+        base_url=None,
+        max_retries=5,
+        backoff=0.5,
+        max_backoff=30.0,
+        timeout=30,
+        pool_size=16,
+        rate_limiter=None,
+        cache=None,
+    ):
+        self.base_url = base_url or "https://api.data.gov/ed/collegescorecard/v1/"
         self.api_key = api_key or "your_api_key_here"
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = cache
+        self._revalidator = None
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+        self._listeners = []
+
+        # One keep-alive session per client so repeated calls and concurrent
+        # page fetches reuse pooled connections instead of new TLS handshakes.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before retry ``attempt`` (Retry-After wins)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        # Exponential backoff with full jitter.
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
 
     def get_data(self, endpoint, params=None):
         """
         Get data from the College Scorecard API
 
+        With a cache, a stored response is served immediately while it is
+        within the cache's hard TTL. Once past the soft TTL it is revalidated
+        in the background with ``If-None-Match``/``If-Modified-Since``, so the
+        request never sits on the caller's path while a copy exists.
+
         Args:
             endpoint (str): API endpoint to query
             params (dict): Query parameters
@@ -18,14 +170,106 @@ class CollegeScorecardClient:
         Returns:
             dict: JSON response from the API
         """
-        if params is None:
-            params = {}
+        params = dict(params or {})
+
+        key = entry = None
+        if self.cache is not None:
+            key = cache_key(endpoint, params)
+            entry = self.cache.lookup(key)
+            if entry is not None and self.cache.servable(entry):
+                if self.cache.is_stale(entry):
+                    self._revalidate_in_background(endpoint, params, key, entry)
+                return entry["data"]
+            if self.cache.offline:
+                raise CacheMiss(f"{endpoint} {params} is not cached (offline mode)")
+
+        return self._fetch(endpoint, params, key, entry)
+
+    def _fetch(self, endpoint, params, key=None, entry=None):
+        """Request ``endpoint``, conditionally when a cached ``entry`` exists."""
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._request(endpoint, params, headers)
+        changed = False
+        if response.status_code == 304 and entry is not None:
+            data = entry["data"]
+            etag, last_modified = entry["etag"], entry["last_modified"]
+        else:
+            data = response.json()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            changed = entry is not None and data != entry["data"]
+        if key is not None:
+            self.cache.put(key, data, etag=etag, last_modified=last_modified)
+        if changed:
+            for listener in list(self._listeners):
+                listener(endpoint, params)
+        return data
+
+    def add_listener(self, callback):
+        """
+        Call ``callback(endpoint, params)`` whenever a cached response is
+        replaced by different data, e.g. after a background revalidation, so
+        results built from the old response can be dropped
+        """
+        self._listeners.append(callback)
+
+    def _request(self, endpoint, params, headers=None):
+        """Send one GET with rate limiting and retries; return the response."""
+        params = {**params, "api_key": self.api_key}
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(
+                    self.base_url + endpoint,
+                    params=params,
+                    headers=headers,
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            self.rate_limiter.update(response.headers)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+            response.raise_for_status()
+            return response
 
-        params["api_key"] = self.api_key
+    def _revalidate_in_background(self, endpoint, params, key, entry):
+        """Refresh a stale entry on the revalidation pool, once per key."""
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            if self._revalidator is None:
+                self._revalidator = ThreadPoolExecutor(
+                    max_workers=REVALIDATE_WORKERS,
+                    thread_name_prefix="scorecard-revalidate",
+                )
 
-        response = requests.get(self.base_url + endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
+        def revalidate():
+            try:
+                self._fetch(endpoint, params, key, entry)
+            except Exception:
+                # The stale copy keeps being served until the hard TTL.
+                logger.debug(
+                    "Revalidating %s %s failed", endpoint, params, exc_info=True
+                )
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+
+        self._revalidator.submit(revalidate)
 
     def get_institutions(self, fields=None, filters=None, page=0, per_page=100):
         """
@@ -51,5 +295,67 @@ class CollegeScorecardClient:
 
         return self.get_data("schools", params)
 
+    def iter_institution_pages(
+        self, fields=None, filters=None, per_page=MAX_PER_PAGE, max_workers=8
+    ):
+        """
+        Iterate over every page of institution-level data
+
+        The first page is fetched on its own to read ``metadata.total``; the
+        remaining pages are then fetched concurrently and yielded in page order.
+
+        Args:
+            fields (list): Fields to return
+            filters (dict): Filters to apply
+            per_page (int): Results per page, capped at MAX_PER_PAGE
+            max_workers (int): Maximum number of pages fetched at once
+
+        Yields:
+            list: The ``results`` of each page
+        """
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        first = self.get_institutions(
+            fields=fields, filters=filters, page=0, per_page=per_page
+        )
+        yield first["results"]
+
+        total = first.get("metadata", {}).get("total", 0)
+        pages = range(1, math.ceil(total / per_page))
+        if not pages:
+            return
+
+        def fetch(page):
+            data = self.get_institutions(
+                fields=fields, filters=filters, page=page, per_page=per_page
+            )
+            return data["results"]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            yield from executor.map(fetch, pages)
+
+    def get_all_institutions(
+        self, fields=None, filters=None, per_page=MAX_PER_PAGE, max_workers=8
+    ):
+        """
+        Get institution-level data for every page matching the filters
+
+        Args:
+            fields (list): Fields to return
+            filters (dict): Filters to apply
+            per_page (int): Results per page, capped at MAX_PER_PAGE
+            max_workers (int): Maximum number of pages fetched at once
+
+        Returns:
+            list: Institution records from all pages
+        """
+        results = []
+        for page in self.iter_institution_pages(
+            fields=fields, filters=filters, per_page=per_page, max_workers=max_workers
+        ):
+            results.extend(page)
+        return results
+
 
-client = CollegeScorecardClient(api_key=os.getenv("COLLEGE_SCORECARD_API_KEY"))
+client = CollegeScorecardClient(
+    api_key=os.getenv("COLLEGE_SCORECARD_API_KEY"), cache=ResponseCache()
+)
@@ -0,0 +1,67 @@
+"""
+Pre-aggregated year x state x ownership x metric cube.
+
+Only positive values are aggregated, matching how the app averages costs and
+sums enrollment. Demographic shares are only counted for institutions that
+report a positive ``student.size``, as the enrollment preparation does.
+"""
+
+import pandas as pd
+
+CUBE_KEYS = ["year", "state", "ownership", "metric"]
+
+
+def build_cube(long, year):
+    """
+    Aggregate one year of long metric rows into the cube
+
+    Args:
+        long (pd.DataFrame): Rows from ``snapshot.frame_to_long``
+        year (str | int): Year the rows belong to
+
+    Returns:
+        pd.DataFrame: ``CUBE_KEYS`` plus ``sum``, ``count`` and ``mean``
+    """
+    long = long[long["value"] > 0]
+    enrolled = long.loc[long["metric"] == "student.size", "unitid"].unique()
+    is_demographic = long["metric"].astype(str).str.startswith("student.demographics.")
+    long = long[~is_demographic | long["unitid"].isin(enrolled)]
+
+    cube = (
+        long.assign(value=long["value"].astype("float64"))
+        .groupby(["state", "ownership", "metric"], observed=True)["value"]
+        .agg(["sum", "count"])
+        .reset_index()
+    )
+    cube.insert(0, "year", int(year))
+    cube["ownership"] = cube["ownership"].astype("int8")
+    cube["state"] = cube["state"].astype(str)
+    cube["metric"] = cube["metric"].astype(str)
+    cube["mean"] = cube["sum"] / cube["count"]
+    return cube
+
+
+def rollup(cube, states=None, ownership=None, metrics=None, by=("ownership", "metric")):
+    """
+    Roll the cube up to the ``by`` dimensions for one selection
+
+    Args:
+        cube (pd.DataFrame): Cube rows, typically for a single year
+        states (str | list): State code(s) to keep; None keeps all
+        ownership (str | int): Ownership code to keep; None keeps all
+        metrics (list): Metrics to keep; None keeps all
+        by (tuple): Dimensions to keep after summing the others away
+
+    Returns:
+        pd.DataFrame: ``by`` columns plus ``sum``, ``count`` and ``mean``
+    """
+    mask = pd.Series(True, index=cube.index)
+    if states:
+        mask &= cube["state"].isin([states] if isinstance(states, str) else states)
+    if ownership:
+        mask &= cube["ownership"] == int(ownership)
+    if metrics is not None:
+        mask &= cube["metric"].isin(metrics)
+    rolled = cube[mask].groupby(list(by))[["sum", "count"]].sum().reset_index()
+    rolled["mean"] = rolled["sum"] / rolled["count"]
+    return rolled
@@ -1,126 +1,300 @@
-import os
+import numpy as np
 import pandas as pd
 import streamlit as st
-from collegescore import CollegeScorecardClient
-
-
-def fetch_college_data(year, control=None, state=None, per_page=100):
-    fields = [
-        f"{year}.cost.tuition.in_state",
-        f"{year}.cost.tuition.out_of_state",
-        f"{year}.cost.attendance.academic_year",
-        f"{year}.cost.avg_net_price.public",
-        f"{year}.cost.avg_net_price.private",
-        f"{year}.student.size",
-        f"{year}.student.demographics.race_ethnicity.white",
-        f"{year}.student.demographics.race_ethnicity.black",
-        f"{year}.student.demographics.race_ethnicity.hispanic",
-        f"{year}.student.demographics.race_ethnicity.asian",
-        f"{year}.student.demographics.race_ethnicity.aian",
-        f"{year}.student.demographics.race_ethnicity.nhpi",
-        f"{year}.student.demographics.race_ethnicity.two_or_more",
-        f"{year}.student.demographics.race_ethnicity.non_resident_alien",
-        f"{year}.student.demographics.race_ethnicity.unknown",
-        f"{year}.student.demographics.first_generation",
-        "school.name",
-        "school.state",
-        "school.control",
-        "school.region_id",
-        "school.ownership",
-    ]
+from collegescore import client, scorecard_fields
+from cube import build_cube, rollup
+from institution_index import InstitutionIndex
+from memo import LRUMemo, frame_fingerprint
+from snapshot import frame_to_long, load_cube, load_snapshot, snapshot_available
+
+OWNERSHIP_TYPES = {1: "Public", 2: "Private Nonprofit", 3: "Private For-Profit"}
+ID_COLUMNS = ["Institution", "State", "Type"]
+COST_METRICS = {
+    "In-State Tuition": "cost.tuition.in_state",
+    "Out-of-State Tuition": "cost.tuition.out_of_state",
+    "Total Cost": "cost.attendance.academic_year",
+    "Net Price (Public)": "cost.avg_net_price.public",
+    "Net Price (Private)": "cost.avg_net_price.private",
+}
+ENROLLMENT_METRICS = {
+    "Enrollment": "student.size",
+    "White": "student.demographics.race_ethnicity.white",
+    "Black": "student.demographics.race_ethnicity.black",
+    "Hispanic": "student.demographics.race_ethnicity.hispanic",
+    "Asian": "student.demographics.race_ethnicity.asian",
+    "First Gen": "student.demographics.first_generation",
+}
+DEMOGRAPHIC_COLUMNS = ["White", "Black", "Hispanic", "Asian", "First Gen"]
+
+# Module-level, so prepared frames survive Streamlit reruns within a process.
+_prepared_cost = LRUMemo(maxsize=32)
+_national = LRUMemo(maxsize=8)
+_cubes = LRUMemo(maxsize=8)
+
+
+def _year_of(params):
+    """Year of the ``f"{year}.{metric}"`` fields requested in ``params``."""
+    for field in str(params.get("fields", "")).split(","):
+        prefix = field.split(".", 1)[0]
+        if prefix.isdigit():
+            return prefix
+    return None
+
+
+def _forget_year(endpoint, params):
+    """Drop a year's loaded and prepared data once a revalidation brings new pages."""
+    year = _year_of(params)
+    if year is not None:
+        _national.discard(year)
+        _cubes.discard(year)
+        _prepared_cost.discard_where(lambda key: key[0] == year)
+
+
+client.add_listener(_forget_year)
+
+
+def fetch_college_data(year, control=None, state=None, per_page=100, max_workers=8):
+    fields = scorecard_fields(year)
     filters = {}
     if control:
         filters["school.ownership"] = control
     if state:
         filters["school.state"] = state
-    client = CollegeScorecardClient(api_key=os.getenv("COLLEGE_SCORECARD_API_KEY"))
-    data = client.get_institutions(fields=fields, filters=filters, per_page=per_page)
-    return data["results"]
-
-
-def prepare_cost_data(df, year):
-    cost_data = pd.DataFrame(
-        {
-            "Institution": df["school.name"],
-            "State": df["school.state"],
-            "Type": df["school.ownership"].map(
-                {1: "Public", 2: "Private Nonprofit", 3: "Private For-Profit"}
-            ),
-            "In-State Tuition": pd.to_numeric(
-                df.get(f"{year}.cost.tuition.in_state", 0), errors="coerce"
-            ),
-            "Out-of-State Tuition": pd.to_numeric(
-                df.get(f"{year}.cost.tuition.out_of_state", 0), errors="coerce"
-            ),
-            "Total Cost": pd.to_numeric(
-                df.get(f"{year}.cost.attendance.academic_year", 0), errors="coerce"
-            ),
-            "Net Price (Public)": pd.to_numeric(
-                df.get(f"{year}.cost.avg_net_price.public", 0), errors="coerce"
-            ),
-            "Net Price (Private)": pd.to_numeric(
-                df.get(f"{year}.cost.avg_net_price.private", 0), errors="coerce"
-            ),
-        }
+    return client.get_all_institutions(
+        fields=fields, filters=filters, per_page=per_page, max_workers=max_workers
+    )
+
+
+def load_college_frame(year, control=None, state=None, max_workers=8):
+    """
+    Load one year of institution data as a DataFrame
+
+    Reads the local Parquet snapshot when ``snapshot.py ingest`` has been run,
+    otherwise falls back to the Scorecard API, fetching up to ``max_workers``
+    pages at once. Either way the columns are the API's dotted field names.
+    """
+    if snapshot_available(year):
+        return load_snapshot(year, control=control, state=state)
+    return pd.DataFrame(
+        fetch_college_data(year, control=control, state=state, max_workers=max_workers)
+    )
+
+
+def _coerce_block(df, columns):
+    """Coerce ``columns`` of ``df`` to one float32 array, missing columns as NaN."""
+    block = df.reindex(columns=columns)
+    try:
+        return block.to_numpy(dtype="float32", na_value=np.nan)
+    except (TypeError, ValueError):
+        # Strings or other non-numeric values: fall back to per-column parsing.
+        return block.apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float32")
+
+
+def _melt_positive(frame, id_vars, value_vars, var_name, value_name):
+    """Melt ``value_vars`` keeping only positive values, without a full copy."""
+    values = frame[value_vars].to_numpy()
+    cols, rows = np.nonzero(values.T > 0)
+    melted = {column: frame[column].array.take(rows) for column in id_vars}
+    melted[var_name] = pd.Categorical.from_codes(cols, categories=value_vars)
+    melted[value_name] = values[rows, cols]
+    return pd.DataFrame(melted)
+
+
+def prepare_base(df, year, metrics=None):
+    """
+    Build the typed frame shared by the cost and enrollment preparations
+
+    The metrics (all cost and enrollment metrics by default) are coerced in a
+    single block operation into float32 columns next to Institution, State and
+    a categorical Type.
+
+    Args:
+        df (pd.DataFrame): Dotted-column frame from ``load_college_frame``
+        year (str): Year whose metrics are used
+        metrics (dict): Label -> metric suffix to include; defaults to every
+            cost and enrollment metric
+
+    Returns:
+        pd.DataFrame: One row per institution
+    """
+    if metrics is None:
+        metrics = {**COST_METRICS, **ENROLLMENT_METRICS}
+    values = _coerce_block(df, [f"{year}.{metric}" for metric in metrics.values()])
+    ownership = pd.to_numeric(df["school.ownership"], errors="coerce")
+    columns = {
+        "Institution": df["school.name"].array,
+        "State": df["school.state"].array,
+        "Type": pd.Categorical(
+            ownership.map(OWNERSHIP_TYPES), categories=list(OWNERSHIP_TYPES.values())
+        ),
+    }
+    # Same-dtype columns are consolidated, so the metrics stay one float32 block.
+    columns.update(zip(metrics, values.T))
+    base = pd.DataFrame(columns, index=df.index)
+    return base
+
+
+def national_index(year, max_workers=8):
+    """
+    Load the national data for ``year`` once and index it by state/ownership
+
+    Subsequent calls in the same process return the cached index, so changing
+    the state or institution type filters never triggers another request. The
+    index is rebuilt (from the response cache) after a revalidation returns
+    new data for the year.
+
+    Args:
+        year (str): Year to load
+        max_workers (int): Pages fetched at once when the year is not cached
+
+    Returns:
+        InstitutionIndex: Index over every institution reported for ``year``
+    """
+    return _national.get_or_compute(
+        year,
+        lambda: InstitutionIndex(load_college_frame(year, max_workers=max_workers)),
+    )
+
+
+def national_loaded(year):
+    """Return True if ``national_index(year)`` is already in memory."""
+    return year in _national
+
+
+def national_cube(year):
+    """
+    Return the aggregate cube for ``year``
+
+    Read from the snapshot when available, otherwise built once from the
+    national data behind ``national_index``.
+    """
+
+    def compute():
+        if snapshot_available(year):
+            return load_cube(year)
+        return build_cube(frame_to_long(national_index(year).frame, year), year)
+
+    return _cubes.get_or_compute(year, compute)
+
+
+def _summary(year, metrics, states, ownership):
+    """Roll the cube up to Type x metric label for the given selection."""
+    rolled = rollup(
+        national_cube(year),
+        states=states,
+        ownership=ownership,
+        metrics=list(metrics.values()),
     )
-    cost_melted = cost_data.melt(
-        id_vars=["Institution", "State", "Type"],
-        value_vars=[
-            "In-State Tuition",
-            "Out-of-State Tuition",
-            "Total Cost",
-            "Net Price (Public)",
-            "Net Price (Private)",
-        ],
-        var_name="Cost Type",
-        value_name="Cost",
+    labels = {metric: label for label, metric in metrics.items()}
+    rolled["Type"] = pd.Categorical(
+        rolled["ownership"].map(OWNERSHIP_TYPES),
+        categories=list(OWNERSHIP_TYPES.values()),
+    )
+    rolled["metric"] = pd.Categorical(
+        rolled["metric"].map(labels), categories=list(metrics)
+    )
+    return rolled.sort_values(["Type", "metric"]).reset_index(drop=True)
+
+
+def cost_summary(year, states=None, ownership=None):
+    """Average positive cost per Type x Cost Type, rolled up from the cube."""
+    rolled = _summary(year, COST_METRICS, states, ownership)
+    return rolled.rename(columns={"metric": "Cost Type", "mean": "Cost"})[
+        ["Type", "Cost Type", "Cost"]
+    ]
+
+
+def enrollment_summary(year, states=None, ownership=None):
+    """Total enrollment per Type and summed demographic shares per Type."""
+    demographics = {label: ENROLLMENT_METRICS[label] for label in DEMOGRAPHIC_COLUMNS}
+    enrollment = _summary(
+        year, {"Enrollment": ENROLLMENT_METRICS["Enrollment"]}, states, ownership
+    )
+    enroll_by_type = enrollment.rename(columns={"sum": "Enrollment"})[
+        ["Type", "Enrollment"]
+    ]
+    demo = _summary(year, demographics, states, ownership)
+    demo_by_type = demo.rename(columns={"metric": "Demographic", "sum": "Count"})[
+        ["Type", "Demographic", "Count"]
+    ]
+    return enroll_by_type, demo_by_type
+
+
+def prepare_cost_table(df, year, base=None):
+    """Institution, State, Type and the cost metrics, one row per institution."""
+    base = prepare_base(df, year, COST_METRICS) if base is None else base
+    return base[ID_COLUMNS + list(COST_METRICS)]
+
+
+def prepare_cost_data(df, year, base=None):
+    cost_columns = list(COST_METRICS)
+    cost_data = prepare_cost_table(df, year, base=base)
+    costs = cost_data[cost_columns]
+    avg_cost = (
+        costs.where(costs > 0)
+        .groupby(cost_data["Type"], observed=True)
+        .mean()
+        .rename_axis(columns="Cost Type")
+        .stack()
+        .rename("Cost")
+        .reset_index()
+    )
+    cost_melted = _melt_positive(
+        cost_data, ID_COLUMNS, cost_columns, var_name="Cost Type", value_name="Cost"
     )
-    cost_melted = cost_melted[cost_melted["Cost"] > 0]
-    avg_cost = cost_melted.groupby(["Type", "Cost Type"])["Cost"].mean().reset_index()
     return cost_data, cost_melted, avg_cost
 
 
-def prepare_enrollment_data(df, year):
-    enroll_data = pd.DataFrame(
-        {
-            "Institution": df["school.name"],
-            "State": df["school.state"],
-            "Type": df["school.ownership"].map(
-                {1: "Public", 2: "Private Nonprofit", 3: "Private For-Profit"}
-            ),
-            "Enrollment": pd.to_numeric(
-                df.get(f"{year}.student.size", 0), errors="coerce"
-            ),
-            "White": pd.to_numeric(
-                df.get(f"{year}.student.demographics.race_ethnicity.white", 0),
-                errors="coerce",
-            ),
-            "Black": pd.to_numeric(
-                df.get(f"{year}.student.demographics.race_ethnicity.black", 0),
-                errors="coerce",
-            ),
-            "Hispanic": pd.to_numeric(
-                df.get(f"{year}.student.demographics.race_ethnicity.hispanic", 0),
-                errors="coerce",
-            ),
-            "Asian": pd.to_numeric(
-                df.get(f"{year}.student.demographics.race_ethnicity.asian", 0),
-                errors="coerce",
-            ),
-            "First Gen": pd.to_numeric(
-                df.get(f"{year}.student.demographics.first_generation", 0),
-                errors="coerce",
-            ),
-        }
+def prepare_enrollment_data(df, year, base=None):
+    base = prepare_base(df, year, ENROLLMENT_METRICS) if base is None else base
+    enroll_data = base.loc[
+        base["Enrollment"] > 0, ID_COLUMNS + list(ENROLLMENT_METRICS)
+    ]
+    enroll_by_type = (
+        enroll_data["Enrollment"]
+        .astype("float64")
+        .groupby(enroll_data["Type"], observed=True)
+        .sum()
+        .reset_index()
     )
-    enroll_data = enroll_data[enroll_data["Enrollment"] > 0]
-    enroll_by_type = enroll_data.groupby("Type")["Enrollment"].sum().reset_index()
-    demo_cols = ["White", "Black", "Hispanic", "Asian", "First Gen"]
-    demo_melted = enroll_data.melt(
-        id_vars=["Institution", "Type"],
-        value_vars=demo_cols,
+    demo_melted = _melt_positive(
+        enroll_data,
+        ["Institution", "Type"],
+        DEMOGRAPHIC_COLUMNS,
         var_name="Demographic",
         value_name="Count",
     )
-    demo_melted = demo_melted[demo_melted["Count"] > 0]
     return enroll_data, enroll_by_type, demo_melted
+
+
+def _selection_key(df, year, control, state):
+    return (year, control, state, frame_fingerprint(df))
+
+
+def prepare_cost(df, year, control=None, state=None, speculative=False):
+    """
+    Memoized ``prepare_cost_table`` for one filter selection
+
+    Results are keyed on ``(year, control, state)`` plus ``frame_fingerprint``
+    of the raw frame, so reruns triggered by unrelated widgets reuse them.
+    The returned frame is shared between reruns and must not be modified.
+
+    Args:
+        df (pd.DataFrame): Dotted-column frame from ``load_college_frame``
+        year (str): Selected year
+        control (str): Selected ``school.ownership`` code
+        state (str): Selected state
+        speculative (bool): Prefetch; stored so it is evicted first
+
+    Returns:
+        pd.DataFrame: ``prepare_cost_table(df, year)``
+    """
+    key = _selection_key(df, year, control, state)
+    return _prepared_cost.get_or_compute(
+        key, lambda: prepare_cost_table(df, year), speculative=speculative
+    )
+
+
+def prepare_cache_stats():
+    """Return hit/miss counters and size of the ``prepare_cost`` memo."""
+    return _prepared_cost.stats()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+
+def _group_positions(values):
+    """
+    Map each distinct value to the sorted row positions holding it
+
+    Args:
+        values (pd.Series): Column to index
+
+    Returns:
+        dict: value -> int32 array of row positions
+    """
+    categorical = pd.Categorical(values)
+    codes = categorical.codes
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    bounds = np.searchsorted(codes[order], np.arange(len(categorical.categories) + 1))
+    return {
+        category: order[bounds[i] : bounds[i + 1]]
+        for i, category in enumerate(categorical.categories)
+    }
+
+
+class InstitutionIndex:
+    """
+    In-memory index over one year of national institution data
+
+    Row positions are precomputed per state and per ownership value, so any
+    state/control selection (including several states at once) is resolved by
+    integer-array union and intersection instead of a new API request.
+
+    Args:
+        df (pd.DataFrame): Dotted-column frame from ``load_college_frame``
+    """
+
+    def __init__(self, df):
+        self.frame = df.reset_index(drop=True)
+        self.by_state = _group_positions(self.frame["school.state"])
+        self.by_ownership = _group_positions(
+            pd.to_numeric(self.frame["school.ownership"], errors="coerce")
+        )
+        self._empty = np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def positions(self, states=None, ownership=None):
+        """
+        Return the sorted row positions matching the selection
+
+        Args:
+            states (str | list): State code(s); None keeps every state
+            ownership (str | int): ``school.ownership`` code; None keeps all
+
+        Returns:
+            np.ndarray | None: int32 positions, or None when nothing is filtered
+        """
+        selected = None
+        if states:
+            if isinstance(states, str):
+                states = [states]
+            parts = [self.by_state.get(state, self._empty) for state in states]
+            selected = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+        if ownership:
+            owned = self.by_ownership.get(int(ownership), self._empty)
+            selected = (
+                owned
+                if selected is None
+                else np.intersect1d(selected, owned, assume_unique=True)
+            )
+        return selected
+
+    def select(self, states=None, ownership=None):
+        """
+        Return the rows matching the selection
+
+        Args:
+            states (str | list): State code(s); None keeps every state
+            ownership (str | int): ``school.ownership`` code; None keeps all
+
+        Returns:
+            pd.DataFrame: Matching rows (the full frame when unfiltered)
+        """
+        positions = self.positions(states=states, ownership=ownership)
+        if positions is None:
+            return self.frame
+        return self.frame.take(positions)
@@ -0,0 +1,196 @@
+"""
+Background prefetch of the Scorecard selections a reader is likely to open next.
+
+After Section 1 renders, ``Prefetcher.schedule`` queues work on a small
+process-wide thread pool, outside the script run:
+
+* ``prepare_cost`` for up to ``$SCORECARD_PREFETCH_PREPARES`` listed states of
+  the current year and institution type - no requests, the national index for
+  the year is already loaded. Results are stored as least recently used, so
+  they never evict the selections the reader has actually opened;
+* ``national_index`` and ``national_cube`` for the years next to the current
+  one, fetched with few page workers so interactive requests keep priority.
+
+The work is bounded by ``$SCORECARD_PREFETCH_WORKERS`` threads (0 disables
+prefetching) and skips API loads once less than ``$SCORECARD_PREFETCH_RESERVE``
+of the hourly quota is left. Pending work is dropped when the selection changes
+or the browser session ends; a load already in flight runs to completion and
+still lands in the caches.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from collegescore import client
+from data import national_cube, national_index, national_loaded, prepare_cost
+from snapshot import YEARS, snapshot_available
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = int(os.getenv("SCORECARD_PREFETCH_WORKERS", "1"))
+# Years on each side of the selected one.
+PREFETCH_DISTANCE = int(os.getenv("SCORECARD_PREFETCH_DISTANCE", "1"))
+# Fraction of the hourly API quota kept for interactive requests.
+QUOTA_RESERVE = float(os.getenv("SCORECARD_PREFETCH_RESERVE", "0.5"))
+# States prepared per selection; well below the 32-entry preparation memo.
+PREFETCH_PREPARES = int(os.getenv("SCORECARD_PREFETCH_PREPARES", "8"))
+PAGE_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS, thread_name_prefix="scorecard-prefetch"
+            )
+        return _executor
+
+
+def neighbouring_years(year, years=YEARS, distance=PREFETCH_DISTANCE):
+    """
+    Return the years within ``distance`` steps of ``year``, nearest first
+
+    Earlier years come before later ones at the same distance, since the year
+    selector defaults to the most recent year.
+    """
+    position = years.index(year)
+    neighbours = []
+    for step in range(1, distance + 1):
+        for i in (position - step, position + step):
+            if 0 <= i < len(years):
+                neighbours.append(years[i])
+    return neighbours
+
+
+def _session_alive(session_id):
+    if session_id is None:
+        return True
+    from streamlit import runtime
+
+    return runtime.exists() and runtime.get_instance().is_active_session(session_id)
+
+
+class Prefetcher:
+    """
+    Warms the data caches around one session's current selection
+
+    Args:
+        session_id (str | None): Streamlit session whose end cancels pending
+            work; None never cancels
+        years (list): Years offered by the year selector
+        distance (int): Years prefetched on each side of the selected one
+        reserve (float): Fraction of the hourly API quota below which years
+            that are not in the local snapshot are skipped
+    """
+
+    def __init__(
+        self,
+        session_id=None,
+        years=YEARS,
+        distance=PREFETCH_DISTANCE,
+        reserve=QUOTA_RESERVE,
+    ):
+        self.session_id = session_id
+        self.years = years
+        self.distance = distance
+        self.reserve = reserve
+        self._selection = None
+        self._generation = 0
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def schedule(self, year, ownership=None, states=()):
+        """
+        Replace any pending work with prefetches around the current selection
+
+        Calling again with the same selection is a no-op, so it is safe on
+        every rerun.
+
+        Args:
+            year (str): Selected year
+            ownership (str): Selected ``school.ownership`` code
+            states (list): States offered by the state selector, "All" included
+
+        Returns:
+            int: Tasks queued
+        """
+        if PREFETCH_WORKERS <= 0:
+            return 0
+        selection = (year, ownership, tuple(states))
+        with self._lock:
+            if selection == self._selection:
+                return 0
+            self._selection = selection
+            generation = self._cancel()
+            tasks = [
+                (self._prepare_state, year, ownership, state)
+                for state in list(states)[:PREFETCH_PREPARES]
+            ]
+            tasks += [
+                (self._load_year, neighbour)
+                for neighbour in neighbouring_years(year, self.years, self.distance)
+            ]
+            executor = _get_executor()
+            self._futures = [
+                executor.submit(self._run, generation, *task) for task in tasks
+            ]
+        return len(tasks)
+
+    def cancel(self):
+        """Drop every task that has not started yet."""
+        with self._lock:
+            self._selection = None
+            self._cancel()
+
+    def _cancel(self):
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        return self._generation
+
+    def _run(self, generation, task, *args):
+        if generation != self._generation or not _session_alive(self.session_id):
+            return
+        try:
+            task(*args)
+        except Exception:
+            logger.debug("Prefetch %s%s failed", task.__name__, args, exc_info=True)
+
+    def _prepare_state(self, year, ownership, state):
+        selected = None if state == "All" else state
+        df = national_index(year).select(states=selected, ownership=ownership)
+        if not df.empty:
+            prepare_cost(df, year, control=ownership, state=state, speculative=True)
+
+    def _load_year(self, year):
+        limiter = client.rate_limiter
+        if (
+            not national_loaded(year)
+            and not snapshot_available(year)
+            and limiter.available() < self.reserve * limiter.capacity
+        ):
+            logger.debug("Skipping prefetch of %s: API quota reserve reached", year)
+            return
+        national_index(year, max_workers=PAGE_WORKERS)
+        national_cube(year)
+
+
+def session_prefetcher():
+    """Return the current Streamlit session's ``Prefetcher``, creating it once."""
+    if "scorecard_prefetcher" not in st.session_state:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        st.session_state.scorecard_prefetcher = Prefetcher(
+            session_id=ctx.session_id if ctx else None
+        )
+    return st.session_state.scorecard_prefetcher
@@ -0,0 +1,245 @@
+"""
+Columnar Parquet snapshot of the College Scorecard fields used by the app.
+
+``python snapshot.py ingest`` downloads every year in ``YEARS`` once and writes
+
+* ``metrics/year=YYYY/*.parquet`` - a long table (unitid, state, ownership,
+  metric, value) with dictionary-encoded state/ownership/metric, sorted so row
+  group statistics let readers skip other states and ownership types;
+* ``schools.parquet`` - one row per institution with its name and location;
+* ``cube/year=YYYY/*.parquet`` - the year x state x ownership x metric
+  aggregates from ``cube.build_cube``.
+
+Both datasets are partitioned by year, so ingesting some years leaves the
+others intact.
+
+``load_snapshot`` reads back only the requested year, filters and metrics and
+returns the same dotted-column frame the API produces.
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from collegescore import YEAR_METRICS, client, scorecard_fields
+from cube import build_cube
+
+YEARS = [f"{y}" for y in range(2017, 2023)]
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parents[1] / "data" / "scorecard"
+ROW_GROUP_SIZE = 16_384
+
+SCHOOL_COLUMNS = {
+    "id": "unitid",
+    "school.name": "name",
+    "school.state": "state",
+    "school.ownership": "ownership",
+    "school.control": "control",
+    "school.region_id": "region_id",
+}
+
+
+def snapshot_dir(directory=None):
+    return Path(directory or os.getenv("SCORECARD_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_DIR)
+
+
+def snapshot_available(year, directory=None):
+    """Return True if ``year`` has been ingested into the snapshot."""
+    root = snapshot_dir(directory)
+    partition = f"year={int(year)}"
+    return (root / "schools.parquet").exists() and all(
+        any((root / dataset / partition).glob("*.parquet"))
+        for dataset in ("metrics", "cube")
+    )
+
+
+def _schools_table(records):
+    schools = pd.DataFrame.from_records(records, columns=list(SCHOOL_COLUMNS))
+    schools = schools.rename(columns=SCHOOL_COLUMNS).dropna(subset=["unitid"])
+    schools = schools.drop_duplicates("unitid").astype(
+        {
+            "unitid": "int32",
+            "state": "category",
+            "ownership": "Int8",
+            "control": "Int8",
+            "region_id": "Int8",
+        }
+    )
+    return schools
+
+
+def frame_to_long(df, year):
+    """
+    Reshape a dotted-column frame into long (unitid, state, ownership, metric,
+    value) rows, dropping missing values
+
+    Args:
+        df (pd.DataFrame): API-shaped frame for ``year``
+        year (str): Year whose metrics are reshaped
+
+    Returns:
+        pd.DataFrame: Long table with categorical state/ownership/metric
+    """
+    columns = [f"{year}.{metric}" for metric in YEAR_METRICS]
+    wide = df.dropna(subset=["id"]).drop_duplicates("id")
+    values = (
+        wide.reindex(columns=columns)
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy("float32")
+    )
+
+    n_rows, n_metrics = values.shape
+    ownership = pd.to_numeric(wide["school.ownership"], errors="coerce")
+    long = pd.DataFrame(
+        {
+            "unitid": wide["id"].to_numpy("int32").repeat(n_metrics),
+            "state": pd.Categorical(wide["school.state"].to_numpy().repeat(n_metrics)),
+            "ownership": pd.Categorical(
+                ownership.astype("Int8").to_numpy().repeat(n_metrics)
+            ),
+            "metric": pd.Categorical.from_codes(
+                np.tile(np.arange(n_metrics), n_rows), categories=YEAR_METRICS
+            ),
+            "value": values.ravel(),
+        }
+    )
+    return long[long["value"].notna()].reset_index(drop=True)
+
+
+def ingest(years=YEARS, directory=None, max_workers=8):
+    """
+    Download every year in ``years`` and (re)write the Parquet snapshot
+
+    Args:
+        years (list): Years to ingest
+        directory (str | Path): Snapshot root; defaults to
+            ``$SCORECARD_SNAPSHOT_DIR`` or ``termproject/data/scorecard``
+        max_workers (int): Concurrent page fetches per year
+    """
+    # Only the ingest path writes datasets; keep pyarrow.dataset out of app startup.
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    root = snapshot_dir(directory)
+    root.mkdir(parents=True, exist_ok=True)
+
+    by_year = {
+        year: client.get_all_institutions(
+            fields=scorecard_fields(year), max_workers=max_workers
+        )
+        for year in years
+    }
+    schools = _schools_table(
+        [record for records in by_year.values() for record in records]
+    )
+    schools_path = root / "schools.parquet"
+    if schools_path.exists():
+        # Keep institutions only reported in years not ingested this time; the
+        # freshly downloaded rows win for the others.
+        schools = pd.concat(
+            [schools, pd.read_parquet(schools_path)], ignore_index=True
+        ).drop_duplicates("unitid")
+        schools = schools.astype({"state": "category"}).reset_index(drop=True)
+    pq.write_table(
+        pa.Table.from_pandas(schools, preserve_index=False),
+        schools_path,
+        use_dictionary=["state"],
+    )
+
+    partitioning = ds.partitioning(pa.schema([("year", pa.int16())]), flavor="hive")
+    for year, records in by_year.items():
+        long = frame_to_long(pd.DataFrame.from_records(records), year)
+        cube = build_cube(long, year).astype({"year": "int16"})
+        ds.write_dataset(
+            pa.Table.from_pandas(cube, preserve_index=False),
+            root / "cube",
+            format="parquet",
+            partitioning=partitioning,
+            existing_data_behavior="delete_matching",
+        )
+        long = long.sort_values(["state", "ownership", "metric", "unitid"])
+        table = pa.Table.from_pandas(long, preserve_index=False).append_column(
+            "year", pa.array([int(year)] * len(long), pa.int16())
+        )
+        ds.write_dataset(
+            table,
+            root / "metrics",
+            format="parquet",
+            partitioning=partitioning,
+            existing_data_behavior="delete_matching",
+            max_rows_per_group=ROW_GROUP_SIZE,
+            min_rows_per_group=ROW_GROUP_SIZE // 4,
+        )
+
+
+def load_cube(year, directory=None):
+    """Read the aggregate cube rows for ``year`` from its snapshot partition."""
+    cube = pd.read_parquet(snapshot_dir(directory) / "cube" / f"year={int(year)}")
+    cube.insert(0, "year", int(year))
+    return cube
+
+
+def load_snapshot(year, control=None, state=None, metrics=None, directory=None):
+    """
+    Read one year of the snapshot as a wide, API-shaped DataFrame
+
+    Only the requested partition, row groups and columns are read; state and
+    ownership filters are pushed down to the Parquet reader.
+
+    Args:
+        year (str | int): Year to load
+        control (str | int): ``school.ownership`` code to keep
+        state (str | list): State code(s) to keep
+        metrics (list): Metric suffixes to load; defaults to all of them
+        directory (str | Path): Snapshot root
+
+    Returns:
+        pd.DataFrame: Dotted-column frame, one row per institution
+    """
+    root = snapshot_dir(directory)
+    filters = []
+    if state:
+        filters.append(("state", "in", [state] if isinstance(state, str) else state))
+    if control:
+        filters.append(("ownership", "=", int(control)))
+
+    schools = pd.read_parquet(root / "schools.parquet", filters=filters or None)
+
+    metric_filters = [("year", "=", int(year))] + filters
+    if metrics is not None:
+        metric_filters.append(("metric", "in", list(metrics)))
+    long = pd.read_parquet(
+        root / "metrics",
+        columns=["unitid", "metric", "value"],
+        filters=metric_filters,
+    )
+    wide = long.pivot_table(
+        index="unitid", columns="metric", values="value", observed=True, aggfunc="first"
+    )
+    wide = wide.reindex(columns=metrics if metrics is not None else YEAR_METRICS)
+    wide.columns = [f"{year}.{metric}" for metric in wide.columns]
+
+    frame = schools.join(wide, on="unitid")
+    inverse = {short: dotted for dotted, short in SCHOOL_COLUMNS.items()}
+    return frame.rename(columns=inverse).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="College Scorecard Parquet snapshot")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subcommands.add_parser("ingest", help="download and write")
+    ingest_parser.add_argument("--years", nargs="+", default=YEARS)
+    ingest_parser.add_argument("--dir", default=None, help="snapshot directory")
+    ingest_parser.add_argument("--max-workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        ingest(args.years, directory=args.dir, max_workers=args.max_workers)
+        print(f"Wrote snapshot for {', '.join(args.years)} to {snapshot_dir(args.dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Cold-start import budget for every app, see ``benchmarks/bench_startup.py``.
+
+Skipped unless ``$STARTUP_BUDGET_MS`` is set, e.g.::
+
+    STARTUP_BUDGET_MS=4000 python -m pytest tests/test_startup_budget.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from benchmarks.bench_startup import APPS, profile  # noqa: E402
+
+BUDGET_MS = os.getenv("STARTUP_BUDGET_MS")
+# Best of this many cold starts per app, as in the benchmark script.
+REPEAT = int(os.getenv("STARTUP_REPEAT", "3"))
+
+
+@pytest.mark.skipif(BUDGET_MS is None, reason="STARTUP_BUDGET_MS is not set")
+@pytest.mark.parametrize("app", list(APPS))
+def test_startup_within_budget(app):
+    result = profile({app: APPS[app]}, REPEAT)[app]
+    slowest = sorted(result["modules"].items(), key=lambda item: -item[1])[:5]
+    assert result["total_ms"] <= float(BUDGET_MS), (
+        f"{app} imports in {result['total_ms']:.1f} ms, over the "
+        f"{float(BUDGET_MS):.0f} ms budget; slowest: {slowest}"
+    )